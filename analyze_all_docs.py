@@ -3,44 +3,109 @@
 import sys
 import os
 import argparse
-import subprocess
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List
 
+from analyze_docs import build_model, process_file
+
+# Serialize stdout so interleaved worker output stays readable
+_print_lock = threading.Lock()
+
+# Cache of path -> [mtime, has_docs] so unchanged documented files
+# skip without being opened at all
+CACHE_FILE = '.analyze_cache.json'
+
+def _load_cache(docs_dir: str) -> dict:
+    """Load the skip cache, tolerating a missing or corrupt file"""
+    try:
+        with open(os.path.join(docs_dir, CACHE_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def _save_cache(docs_dir: str, cache: dict) -> None:
+    """Atomically rewrite the skip cache"""
+    cache_path = os.path.join(docs_dir, CACHE_FILE)
+    tmp_path = cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not save analysis cache: {e}")
+
+def _iter_adoc(path: str):
+    """Yield .adoc file paths under path using scandir's cached DirEntry info"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_adoc(entry.path)
+            elif entry.name.endswith('.adoc') and entry.is_file():
+                yield entry.path
+
 def find_adoc_files(folder_path: str) -> List[str]:
     """Find all .adoc files in the given directory and its subdirectories"""
-    adoc_files = []
-    
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            if file.endswith('.adoc'):
-                full_path = os.path.join(root, file)
-                adoc_files.append(full_path)
-    
-    return sorted(adoc_files)  # Sort for consistent ordering
+    return sorted(_iter_adoc(folder_path))  # Sort for consistent ordering
+
+def _needs_docs(file_path: str, header: str) -> bool:
+    """Line-oriented check for missing documentation.
+
+    Short-circuits on the first TODO marker instead of reading the whole
+    file into memory just to run two substring tests.
+    """
+    needle = f"== {header}"
+    found_header = False
+    with open(file_path, 'r') as f:
+        for line in f:
+            if 'TODO' in line:
+                return True
+            if not found_header and needle in line:
+                found_header = True
+    return not found_header
+
+def analyze_file(file_path: str, header: str, model, skip_existing: bool = False,
+                 cache: dict = None) -> str:
+    """Analyze a single file in-process via analyze_docs.process_file.
+
+    Returns 'success', 'failure' or 'skipped'.
+    """
+    if skip_existing:
+        # Quick check for existing documentation
+        try:
+            mtime = os.stat(file_path).st_mtime
+            cached = cache.get(file_path) if cache is not None else None
+            if cached and cached[0] == mtime and cached[1]:
+                # Unchanged since last seen documented - skip the read
+                with _print_lock:
+                    print(f"\nSkipping {file_path} - already has documentation")
+                return 'skipped'
+            if not _needs_docs(file_path, header):
+                if cache is not None:
+                    cache[file_path] = [mtime, True]
+                with _print_lock:
+                    print(f"\nSkipping {file_path} - already has documentation")
+                return 'skipped'
+        except Exception as e:
+            with _print_lock:
+                print(f"Error reading {file_path}: {e}")
+            return 'failure'
 
-def analyze_file(file_path: str, header: str) -> bool:
-    """Run analyze_docs.py on a single file"""
-    print(f"\nAnalyzing: {file_path}")
-    
-    cmd = [
-        './analyze_docs.py',
-        file_path,
-        '--header', header
-    ]
-    
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error analyzing {file_path}:")
-        print(e.stderr)
-        return False
+        with _print_lock:
+            print(f"\nAnalyzing: {file_path}")
+        process_file(file_path, header, model=model)
+        if cache is not None:
+            cache[file_path] = [os.stat(file_path).st_mtime, True]
+        return 'success'
+    except Exception as e:
+        with _print_lock:
+            print(f"Error analyzing {file_path}:")
+            print(e)
+        return 'failure'
 
 def main():
     parser = argparse.ArgumentParser(description='Run analyze_docs.py on all .adoc files')
@@ -48,7 +113,8 @@ def main():
     parser.add_argument('--header', default='Documentation', help='Header section to analyze (default: Documentation)')
     parser.add_argument('--anthropic-key', help='Anthropic API key')
     parser.add_argument('--skip-existing', action='store_true', help='Skip files that already have documentation')
-    
+    parser.add_argument('--jobs', type=int, default=8, help='Number of files to analyze concurrently (default: 8)')
+
     args = parser.parse_args()
     
     # Handle API key
@@ -65,31 +131,34 @@ def main():
     adoc_files = find_adoc_files(args.docs_dir)
     print(f"Found {len(adoc_files)} .adoc files")
     
-    # Process each file
+    # Process files concurrently - each analysis blocks on an API call
     success_count = 0
     failure_count = 0
     skipped_count = 0
-    
-    for file_path in adoc_files:
-        if args.skip_existing:
-            # Quick check for existing documentation
-            try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                    if f"== {args.header}" in content and "TODO" not in content:
-                        print(f"\nSkipping {file_path} - already has documentation")
-                        skipped_count += 1
-                        continue
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
+
+    # Build the model once so every worker shares one client/connection pool
+    model = build_model()
+
+    cache = _load_cache(args.docs_dir) if args.skip_existing else None
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(analyze_file, path, args.header, model,
+                        args.skip_existing, cache): path
+            for path in adoc_files
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            if result == 'success':
+                success_count += 1
+            elif result == 'skipped':
+                skipped_count += 1
+            else:
                 failure_count += 1
-                continue
-        
-        if analyze_file(file_path, args.header):
-            success_count += 1
-        else:
-            failure_count += 1
     
+    if cache is not None:
+        _save_cache(args.docs_dir, cache)
+
     # Print summary
     print("\n=== Analysis Summary ===")
     print(f"Total files found: {len(adoc_files)}")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sys
 import argparse
+from itertools import chain, islice
 from typing import List, Tuple, Optional
 from langchain_anthropic import ChatAnthropic
 from langchain_core.prompts import ChatPromptTemplate
@@ -16,17 +17,30 @@ def parse_section_path(path: str) -> List[str]:
 
 def get_heading_level(line: str) -> Tuple[int, str]:
     """Get the level of an AsciiDoc heading and the heading text"""
-    if line.startswith("="):
-        level = len(line) - len(line.lstrip("="))
-        text = line.lstrip("= ").strip()
-        return level, text
-    return 0, ""
-
-
-def find_section_index(lines: List[str], section_name: str) -> int:
-    """Find the index of a section heading in the file"""
-    for i, line in enumerate(lines):
-        level, heading = get_heading_level(line)
+    # Fast path: most lines aren't headings, reject on the first char
+    if not line or line[0] != "=":
+        return 0, ""
+    level = 0
+    n = len(line)
+    while level < n and line[level] == "=":
+        level += 1
+    text = line[level:].lstrip("= ").strip()
+    return level, text
+
+
+def index_headings(lines: List[str]) -> List[Tuple[int, int, str]]:
+    """Build a (line_index, level, heading) table for all headings in one pass"""
+    return [
+        (i, level, heading)
+        for i, line in enumerate(lines)
+        for level, heading in (get_heading_level(line),)
+        if level
+    ]
+
+
+def find_section_index(headings: List[Tuple[int, int, str]], section_name: str) -> int:
+    """Find the line index of a section heading in the heading table"""
+    for i, level, heading in headings:
         if (
             level == 2 and heading.strip() == section_name
         ):  # Specifically look for level 2 (==) headings
@@ -34,34 +48,49 @@ def find_section_index(lines: List[str], section_name: str) -> int:
     return -1
 
 
-def extract_section_content(file_content: str, section_name: str) -> Optional[str]:
+def _next_section_index(
+    headings: List[Tuple[int, int, str]], start_idx: int, default: int
+) -> int:
+    """Find the line index of the first level 1/2 heading after start_idx"""
+    for i, level, _ in headings:
+        if i > start_idx and level <= 2:
+            return i
+    return default
+
+
+def extract_section_content(
+    file_content: str,
+    section_name: str,
+    lines: Optional[List[str]] = None,
+    headings: Optional[List[Tuple[int, int, str]]] = None,
+) -> Optional[str]:
     """Extract content from a specific section in the AsciiDoc file"""
-    lines = file_content.split("\n")
-    start_idx = find_section_index(lines, section_name)
+    if lines is None:
+        lines = file_content.split("\n")
+    if headings is None:
+        headings = index_headings(lines)
+    start_idx = find_section_index(headings, section_name)
 
     if start_idx == -1:
         print(f"Debug: Available sections:")
-        for line in lines:
-            level, heading = get_heading_level(line)
-            if level > 0:
-                print(f"Level {level}: {heading}")
+        for _, level, heading in headings:
+            print(f"Level {level}: {heading}")
         return None
 
-    content = []
-    # Start capturing from the line after the heading
-    for i in range(start_idx + 1, len(lines)):
-        level, _ = get_heading_level(lines[i])
-        # Stop if we hit another level 2 or higher heading
-        if level > 0 and level <= 2:
-            break
-        content.append(lines[i])
+    # Capture from the line after the heading up to the next level 1/2 heading
+    end_idx = _next_section_index(headings, start_idx, len(lines))
 
-    return "\n".join(content).strip()
+    return "\n".join(lines[start_idx + 1 : end_idx]).strip()
 
 
-def analyze_code(content: str, header_name: str) -> str:
-    """Use Langchain with Claude to analyze the code content"""
-    model = ChatAnthropic(
+# Module-level model singleton so the underlying HTTP client keeps its
+# keep-alive connection across files instead of re-handshaking per call
+_MODEL = None
+
+
+def build_model() -> ChatAnthropic:
+    """Build the ChatAnthropic client used for code analysis"""
+    return ChatAnthropic(
         model_name="claude-3-sonnet-20240229",
         api_key=os.environ["ANTHROPIC_API_KEY"],
         max_tokens=1024,
@@ -69,6 +98,20 @@ def analyze_code(content: str, header_name: str) -> str:
         max_retries=3,
     )
 
+
+def _get_model() -> ChatAnthropic:
+    """Return the shared ChatAnthropic client, building it lazily"""
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = build_model()
+    return _MODEL
+
+
+def analyze_code(content: str, header_name: str, model: Optional[ChatAnthropic] = None) -> str:
+    """Use Langchain with Claude to analyze the code content"""
+    if model is None:
+        model = _get_model()
+
     template = """You are analyzing code to generate documentation.
     Please analyze the following code section of a project and provide a clear, concise documentation. It may include as needed:
     1. Overview of what the code does
@@ -101,31 +144,90 @@ def analyze_code(content: str, header_name: str) -> str:
     return chain.invoke({"content": content})
 
 
-def update_documentation_section(file_content: str, analysis: str, header: str) -> str:
+def update_documentation_section(
+    file_content: str,
+    analysis: str,
+    header: str,
+    lines: Optional[List[str]] = None,
+    headings: Optional[List[Tuple[int, int, str]]] = None,
+) -> str:
     """Update the Documentation section with the analysis"""
-    lines = file_content.split("\n")
+    if lines is None:
+        lines = file_content.split("\n")
+    if headings is None:
+        headings = index_headings(lines)
 
     # Find Documentation section
-    doc_index = find_section_index(lines, header)
+    doc_index = find_section_index(headings, header)
     if doc_index == -1:
         raise ValueError("Documentation section not found in file")
 
     # Find the next section after Documentation to know where to stop
-    next_section_index = len(lines)
-    for i in range(doc_index + 1, len(lines)):
-        level, _ = get_heading_level(lines[i])
-        if level > 0 and level <= 2:  # Same or higher level heading
-            next_section_index = i
-            break
+    next_section_index = _next_section_index(headings, doc_index, len(lines))
+
+    # Replace everything between the Documentation heading and the next
+    # section, joining straight from an iterator so no intermediate list
+    # of the whole file is materialized
+    return "\n".join(
+        chain(
+            islice(lines, doc_index + 1),  # Keep the Documentation heading
+            ("", analysis.strip(), ""),  # Analysis with surrounding blank lines
+            islice(lines, next_section_index, None),  # The rest of the file
+        )
+    )
+
+
+def process_file(
+    file_path: str,
+    header: Optional[str] = None,
+    from_section: Optional[str] = None,
+    model: Optional[ChatAnthropic] = None,
+    content: Optional[str] = None,
+) -> None:
+    """Analyze one AsciiDoc file and update its documentation section in place.
+
+    Accepts a pre-built ChatAnthropic model so batch callers can share one
+    client (and its HTTP connection pool) across many files, and optionally
+    the already-loaded file content so callers don't trigger a second read.
+    """
+    # Read the file unless the caller already has it in memory
+    if content is None:
+        with open(file_path, "r") as f:
+            content = f.read()
+
+    # Split and index headings once, shared by extract and update below
+    lines = content.split("\n")
+    headings = index_headings(lines)
+
+    # Extract code section content
+    print(f"Looking {from_section or 'Code'} section in {file_path}...")
+    code_content = extract_section_content(
+        content, from_section or "Code", lines, headings
+    )
+
+    if not code_content:
+        raise ValueError("Code section not found in the file")
 
-    # Replace everything between Documentation heading and next section
-    new_lines = lines[: doc_index + 1]  # Keep the Documentation heading
-    new_lines.extend(
-        ["", analysis.strip(), ""]
-    )  # Add analysis with surrounding blank lines
-    new_lines.extend(lines[next_section_index:])  # Add the rest of the file
+    num_lines = len(code_content.split("\n"))
+    print(f"Found code section with {num_lines} lines")
 
-    return "\n".join(new_lines)
+    # Generate analysis of the code
+    print("Analyzing code...")
+    analysis = analyze_code(code_content, header or "Code", model)
+
+    # Update the documentation section
+    print("Updating documentation...")
+    updated_content = update_documentation_section(
+        content, analysis, header or "Documentation", lines, headings
+    )
+
+    # Write back to the file
+    with open(file_path, "w") as f:
+        f.write(updated_content)
+    print("================New File====================")
+    print(updated_content)
+
+    print(f"\nSuccessfully updated documentation in {file_path}")
 
 
 def main():
@@ -149,40 +251,7 @@ def main():
         sys.exit(1)
 
     try:
-        # Read the file
-        with open(args.file, "r") as f:
-            content = f.read()
-
-        # Extract code section content
-        print(f"Looking {args.from_section or 'Code'} section in {args.file}...")
-        code_content = extract_section_content(content, args.from_section or "Code")
-
-        if not code_content:
-            print(f"Error: Code section not found in the file")
-            sys.exit(1)
-
-        print(f"Found code section with {len(code_content.split('\n'))} lines")
-
-        # Generate analysis of the code
-        print("Analyzing code...")
-        analysis = analyze_code(code_content, args.header or "Code")
-        # print("Analysis:\n")
-        # print(analysis)
-
-        # Update the documentation section
-        print("Updating documentation...")
-        updated_content = update_documentation_section(
-            content, analysis, args.header or "Documentation"
-        )
-
-        # Write back to the file
-        with open(args.file, "w") as f:
-            f.write(updated_content)
-        print("================New File====================")
-        print(updated_content)
-
-        print(f"\nSuccessfully updated documentation in {args.file}")
-
+        process_file(args.file, args.header, args.from_section)
     except FileNotFoundError:
         print(f"Error: File '{args.file}' not found")
         sys.exit(1)
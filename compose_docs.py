@@ -2,7 +2,11 @@
 
 import sys
 import argparse
+import functools
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
 from nkbip_converter import (
@@ -13,10 +17,10 @@ from nkbip_converter import (
     add_reference_to_index,
     print_event_summary,
     encode_event_id,
-    publish_event,
     read_encrypted_key,
 )
 from modules.adoc_parser import parse_adoc_file
+from modules.event_publisher import publish_event, publish_events
 
 
 def find_top_doc(folder_path: str, top_file: Optional[str]) -> Optional[str]:
@@ -27,33 +31,79 @@ def find_top_doc(folder_path: str, top_file: Optional[str]) -> Optional[str]:
     return top_path if os.path.exists(top_path) else None
 
 
-def parse_docs_folder(folder_path: str, top_file: Optional[str]) -> List[Dict]:
+def _iter_adoc(path: str):
+    """Yield .adoc file paths under path using scandir's cached DirEntry info"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_adoc(entry.path)
+            elif entry.name.endswith(".adoc") and entry.is_file():
+                yield entry.path
+
+
+# Pre-rendered heading prefixes for levels 1-6
+_EQ = ("", "=", "==", "===", "====", "=====", "======")
+
+
+@dataclass(frozen=True, slots=True)
+class DocEntry:
+    """A parsed .adoc file; slots keep per-doc memory and lookups cheap"""
+
+    content: str
+    file_path: str
+    rel_path: str
+    sections: List[Dict]
+    is_top: bool
+
+
+@dataclass(frozen=True, slots=True)
+class SectionEvent:
+    """A created 30041 event plus the fields the index build needs"""
+
+    event: Dict
+    title: str
+    d_tag: str
+
+
+def _parse_one(full_path: str) -> Optional[Dict]:
+    try:
+        return parse_adoc_file(full_path)
+    except Exception as e:
+        print(f"Warning: Failed to parse {full_path}: {e}")
+        return None
+
+
+def parse_docs_folder(folder_path: str, top_file: Optional[str]) -> List[DocEntry]:
     """Parse all .adoc files, preserving paths for naming"""
     docs = []
-
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            if file.endswith(".adoc"):
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, folder_path)
-                try:
-                    doc = parse_adoc_file(full_path)
-                    # Store full document details
-                    docs.append(
-                        {
-                            "content": doc.get("content", ""),
-                            "file_path": full_path,
-                            "rel_path": rel_path,
-                            "sections": doc.get("sections", []),
-                            "is_top": bool(top_file and file == top_file),
-                        }
-                    )
-                except Exception as e:
-                    print(f"Warning: Failed to parse {full_path}: {e}")
+    paths = list(_iter_adoc(folder_path))
+
+    # Parsing is read-heavy, so overlap disk I/O across files
+    with ThreadPoolExecutor() as pool:
+        parsed = pool.map(_parse_one, paths)
+
+        for full_path, doc in zip(paths, parsed):
+            if doc is None:
+                continue
+            file = os.path.basename(full_path)
+            rel_path = os.path.relpath(full_path, folder_path)
+            # Store full document details
+            docs.append(
+                DocEntry(
+                    content=doc.get("content", ""),
+                    file_path=full_path,
+                    rel_path=rel_path,
+                    sections=doc.get("sections", []),
+                    is_top=bool(top_file and file == top_file),
+                )
+            )
 
     return docs
 
 
+@functools.lru_cache(maxsize=None)
 def get_event_name(project_name: str, rel_path: str) -> str:
     """Create event name from project and relative path"""
     # Remove .adoc extension
@@ -73,40 +123,44 @@ def get_event_name(project_name: str, rel_path: str) -> str:
 
 
 def create_content_event(
-    doc: Dict, project_name: str, key: str, author: Optional[str] = None
-) -> Dict:
+    doc: DocEntry, project_name: str, key: str, author: Optional[str] = None
+) -> SectionEvent:
     # Get event name from path
-    event_name = get_event_name(project_name, doc["rel_path"])
-    filename = os.path.basename(doc["file_path"])
+    event_name = get_event_name(project_name, doc.rel_path)
+    filename = os.path.basename(doc.file_path)
     name_without_ext = os.path.splitext(filename)[0]
 
-    # Special handling for main project file
-    if doc.get("is_main"):
-        content = [f"= Main: {project_name}"]
-    else:
-        content = [f"= {name_without_ext}"]
+    # Write sections into one growable buffer instead of a list of
+    # fragments joined at the end
+    buf = io.StringIO()
+    buf.write(f"= {name_without_ext}\n")
 
-    # Add sections
-    for section in doc["sections"]:
-        heading = "=" * section["level"] + " " + section["title"]
-        content.append(heading)
-        if section["content"].strip():
-            content.append(section["content"].strip())
-        content.append("")  # Add blank line between sections
+    # Add sections, reusing the heading line cached by the parser
+    for section in doc.sections:
+        heading = section.get("heading_line") or (
+            _EQ[section["level"]] + " " + section["title"]
+        )
+        buf.write(heading)
+        buf.write("\n")
+        body = section["content"].strip()
+        if body:
+            buf.write(body)
+            buf.write("\n")
+        buf.write("\n")  # Add blank line between sections
 
     # Create event
     tags = create_section_tags(project_name, event_name)
     if author:
         tags.append(["author", author])
 
-    event = create_event(30041, "\n".join(content).strip(), tags, key)
+    event = create_event(30041, buf.getvalue().rstrip(), tags, key)
     if verify_event(event):
         print(f"Created 30041 for {event_name}")
-        return {
-            "event": event,
-            "title": event_name,
-            "d_tag": next(tag[1] for tag in tags if tag[0] == "d"),
-        }
+        return SectionEvent(
+            event=event,
+            title=event_name,
+            d_tag=next(tag[1] for tag in tags if tag[0] == "d"),
+        )
     else:
         print(f"Failed to verify event for {event_name}")
         sys.exit(1)
@@ -162,17 +216,22 @@ def main():
     all_events = []
     all_references = []
 
-    # Process docs in order: top doc (if exists) -> other docs
-    if args.top_file:
-        top_doc = next((doc for doc in docs if doc.get("is_top")), None)
-        if top_doc:
-            top_event = create_content_event(top_doc, project_name, key, args.author)
-            all_events.append(("Top Content", top_event))
-            all_references.append(top_event)
-            print(f"Created top event: {top_event['title']}")
+    # Partition docs in one pass: top doc (if exists) -> other docs
+    top_doc = None
+    other_docs = []
+    for doc in docs:
+        if doc.is_top:
+            top_doc = doc
+        else:
+            other_docs.append(doc)
+
+    if args.top_file and top_doc:
+        top_event = create_content_event(top_doc, project_name, key, args.author)
+        all_events.append(("Top Content", top_event))
+        all_references.append(top_event)
+        print(f"Created top event: {top_event.title}")
 
     # Process all remaining docs
-    other_docs = [doc for doc in docs if not doc.get("is_top")]
     for doc in other_docs:
         event = create_content_event(doc, project_name, key, args.author)
         all_events.append(("Content", event))
@@ -187,13 +246,16 @@ def main():
     # Add all references (main event will be first as it's first in all_references)
     for ref in all_references:
         root_tags = add_reference_to_index(
-            root_tags, ref["event"], ref["d_tag"], primary_relay
+            root_tags, ref.event, ref.d_tag, primary_relay
         )
 
     root_index = create_event(30040, "", root_tags, key)
     if verify_event(root_index):
         print(f"Created root 30040 index")
-        all_events.append(("Root Index", {"event": root_index, "title": project_name}))
+        root_d_tag = next(tag[1] for tag in root_tags if tag[0] == "d")
+        all_events.append(
+            ("Root Index", SectionEvent(event=root_index, title=project_name, d_tag=root_d_tag))
+        )
     else:
         print("Failed to verify root index!")
         sys.exit(1)
@@ -202,23 +264,37 @@ def main():
     print("\n=== Events Summary ===")
     for event_type, event in all_events:
         print(f"\n{event_type}:")
-        print_event_summary(event["event"])
+        print_event_summary(event.event)
 
     # Get confirmation
     if input("\nReady to publish these events? (y/N): ").lower() != "y":
         print("Publication cancelled.")
         sys.exit(0)
 
-    # Publish events in order: main -> others -> root
+    # Publish content events as a concurrent batch, then the root index
+    # last so it never references sections that aren't on the relay yet
     print(f"\nPublishing events to relays: {', '.join(args.relays)}")
     all_success = True
 
-    for event_type, event in all_events:
-        print(f"\nPublishing {event_type}...")
-        if not publish_event(event["event"], args.relays):
+    content_entries = [
+        (event_type, event)
+        for event_type, event in all_events
+        if event_type != "Root Index"
+    ]
+    print(f"\nPublishing {len(content_entries)} content event(s)...")
+    results = publish_events(
+        [event.event for _, event in content_entries], args.relays
+    )
+    for (event_type, _), success in zip(content_entries, results):
+        if not success:
             print(f"Failed to publish {event_type}!")
             all_success = False
 
+    print("\nPublishing Root Index...")
+    if not publish_event(root_index, args.relays):
+        print("Failed to publish Root Index!")
+        all_success = False
+
     if all_success:
         print("\nAll events published successfully!")
 
@@ -3,9 +3,11 @@ import os
 import sys
 import argparse
 import pathlib
+import shutil
 
 
-def create_adoc_content(file_path):
+def write_adoc_file(file_path, adoc_file):
+    """Write the AsciiDoc wrapper for file_path, streaming the code body"""
     # Get relative path from project root by first getting absolute path
     abs_path = os.path.abspath(file_path)
     rel_path = os.path.relpath(abs_path, os.path.dirname(os.path.dirname(abs_path)))
@@ -15,12 +17,8 @@ def create_adoc_content(file_path):
     name_without_ext, ext = os.path.splitext(filename)
     ext = ext.lstrip(".")  # Remove the leading dot from extension
 
-    # Read the Python file content
-    with open(file_path, "r") as f:
-        code_content = f.read()
-
-    # Create AsciiDoc content
-    content = f"""= {name_without_ext}.{ext}
+    # AsciiDoc template split around the code body
+    prefix = f"""= {name_without_ext}.{ext}
 
 
 == Documentation
@@ -36,10 +34,29 @@ TODO: Add documentation for this module
 
 [source]
 ----
-{code_content}
-----
 """
-    return content
+    suffix = "\n----\n"
+
+    # Stream the source file between prefix and suffix so memory stays
+    # constant regardless of file size
+    with open(file_path, "rb") as src, open(adoc_file, "wb") as dst:
+        dst.write(prefix.encode())
+        shutil.copyfileobj(src, dst, 1 << 20)
+        dst.write(suffix.encode())
+
+
+def _iter_files(path):
+    """Yield file paths under path, skipping hidden directories, via os.scandir"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                # Skip hidden directories (starting with .)
+                if not entry.name.startswith("."):
+                    yield from _iter_files(entry.path)
+            elif entry.is_file():
+                yield entry.path
 
 
 def main():
@@ -66,35 +83,35 @@ def main():
     print(f"Absolute path: {abs_input_dir}")
     print(f"List of extensions: {args.exts}")
 
-    for root, dirs, files in os.walk(abs_input_dir):
-        # Skip hidden directories (starting with .)
-        dirs[:] = [d for d in dirs if not d.startswith(".")]
-
-        for file in files:
-            if not any(file.endswith(ext) if ext != "*" else True for ext in args.exts):
-                print(f"Skipping file: {file}")
-            else:
-                print(f"Processing file: {file}")
-                # Get full path to file
-                file_path = os.path.join(root, file)
-                # Create corresponding docs directory structure
-                doc_dir = os.path.join(
-                    args.output_dir, os.path.relpath(root, abs_input_dir)
-                )
-                if not os.path.exists(doc_dir):
-                    os.makedirs(doc_dir)
-
-                # Create .adoc file path
-                name_without_ext, ext = os.path.splitext(file)
-                ext = ext.lstrip(".")  # Remove the leading dot
-                adoc_file = os.path.join(doc_dir, f"{name_without_ext}_{ext}.adoc")
-
-                # Generate and write content
-                content = create_adoc_content(file_path)
-                with open(adoc_file, "w") as f:
-                    f.write(content)
-
-                print(f"Created: {adoc_file}")
+    # Normalize extensions once so the per-file test is a single set lookup
+    accept_all = "*" in args.exts
+    exts_set = frozenset(
+        ext if ext.startswith(".") else "." + ext for ext in args.exts if ext != "*"
+    )
+
+    for file_path in _iter_files(abs_input_dir):
+        file = os.path.basename(file_path)
+        root = os.path.dirname(file_path)
+        if not accept_all and os.path.splitext(file)[1] not in exts_set:
+            print(f"Skipping file: {file}")
+        else:
+            print(f"Processing file: {file}")
+            # Create corresponding docs directory structure
+            doc_dir = os.path.join(
+                args.output_dir, os.path.relpath(root, abs_input_dir)
+            )
+            if not os.path.exists(doc_dir):
+                os.makedirs(doc_dir)
+
+            # Create .adoc file path
+            name_without_ext, ext = os.path.splitext(file)
+            ext = ext.lstrip(".")  # Remove the leading dot
+            adoc_file = os.path.join(doc_dir, f"{name_without_ext}_{ext}.adoc")
+
+            # Generate and write content
+            write_adoc_file(file_path, adoc_file)
+
+            print(f"Created: {adoc_file}")
 
 
 if __name__ == "__main__":
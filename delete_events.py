@@ -1,18 +1,30 @@
 #!/usr/bin/env python3
 
 import argparse
+import functools
 import json
 import subprocess
 import sys
 import os
 from typing import List, Dict, Any
 
+# orjson parses Nostr-sized events several times faster than stdlib json;
+# fall back quietly when it isn't installed
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
 # Import the modules from your existing codebase
 try:
-    from modules.key_utils import read_encrypted_key
+    from modules.key_utils import read_encrypted_key, resolve_key
     from modules.event_creator import create_event, decrypt_key
     from modules.event_verifier import verify_event
-    from modules.event_publisher import publish_event
+    from modules.event_publisher import publish_event, publish_events
     from modules.event_utils import print_event_summary
     from modules.event_encoder import encode_event_id
 except ImportError:
@@ -45,33 +57,39 @@ def fetch_events_by_kind(
             cmd.extend(["-s", str(since)])
         cmd.append(relay)
 
-        process = subprocess.run(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        # Stream nak's stdout so JSON decoding overlaps the relay transfer
+        # instead of buffering the whole reply first
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
         )
 
-        if process.returncode != 0:
-            raise Exception(f"Failed to fetch events: {process.stderr}")
-
-        # Parse JSON output
         events = []
-        output_lines = process.stdout.strip().split("\n")
-
-        for line in output_lines:
-            if not line or line.startswith("connecting") or line.startswith("ok."):
+        for line in process.stdout:
+            line = line.strip()
+            if not line or line.startswith(("connecting", "ok.")):
                 continue
 
             try:
-                event = json.loads(line)
+                event = _json_loads(line)
                 events.append(event)
-            except json.JSONDecodeError:
+            except _JSONDecodeError:
                 print(f"Warning: Could not parse JSON: {line}")
 
+        process.wait()
+        if process.returncode != 0:
+            raise Exception(f"Failed to fetch events: {process.stderr.read()}")
+
         return events
     except Exception as e:
         print(f"Error fetching events: {e}")
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=None)
 def get_pubkey(key: str) -> str:
     """Get public key from private key."""
     try:
@@ -152,10 +170,10 @@ def main():
     print(f"Target kind: {args.kind}")
     print(f"Relay: {args.relay}")
 
-    # Read the private key
-
-    key = read_encrypted_key(args.nsec) if "ncryptsec" in args.nsec else args.nsec
-    key = decrypt_key(key)
+    # Read the private key, classifying it once (path, ncryptsec or plain)
+    kind, key = resolve_key(args.nsec)
+    if kind == "ncryptsec":
+        key = decrypt_key(key)
 
     # Get pubkey
     pubkey = get_pubkey(key)
@@ -207,29 +225,25 @@ def main():
         print("Operation cancelled.")
         sys.exit(0)
 
-    # Process each batch
+    # Create all batch deletion events up front (signing reuses the
+    # already-decrypted key), then publish them as one concurrent batch
+    deletion_events = []
     for i, batch in enumerate(batches, 1):
-        print(f"\nProcessing batch {i}/{len(batches)} ({len(batch)} events)...")
-
-        # Create deletion event for this batch
+        print(f"\nCreating deletion request {i}/{len(batches)} ({len(batch)} events)...")
         deletion_event = create_deletion_request(batch, args.kind, args.reason, key)
 
         # Print event summary
         print("\nDeletion event details:")
         print_event_summary(deletion_event)
+        deletion_events.append(deletion_event)
 
-        # Publish event
-        print(f"Publishing deletion request to {args.relay}...")
-        if publish_event(deletion_event, [args.relay]):
+    print(f"\nPublishing {len(deletion_events)} deletion request(s) to {args.relay}...")
+    results = publish_events(deletion_events, [args.relay])
+    for i, success in enumerate(results, 1):
+        if success:
             print(f"Successfully published deletion request for batch {i}")
         else:
             print(f"Failed to publish deletion request for batch {i}")
-            if (
-                len(batches) > 1
-                and input("Continue with next batch? (y/N): ").lower() != "y"
-            ):
-                print("Operation cancelled.")
-                sys.exit(1)
 
     print("\nEvent deletion process complete!")
     nevent = encode_event_id(deletion_event, [args.relay], note_format=True)
@@ -13,27 +13,33 @@ Usage:
 
 import argparse
 import json
+import queue
 import sys
 import os
 import subprocess
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Tuple, Optional
 import sys
 
 # Try to import required modules
 try:
-    from modules.event_creator import create_event, create_a_tag
+    from modules.event_creator import create_event, create_a_tag, ensure_key_loaded
     from modules.event_verifier import verify_event
     from modules.event_encoder import encode_event_id
-    from modules.event_publisher import publish_event
+    from modules.event_publisher import publish_event, publish_events_batch
     from modules.event_utils import (
         print_event_summary,
         create_traceback_events_from_index,
     )
     from modules.nak_utils import nak_decode
+    from modules.nip19 import encode_nevent, decode as nip19_decode
+    from modules import _json
     from modules.key_utils import read_encrypted_key
-    from modules.event_embedder import create_embedding_event
+    from modules.event_embedder import create_embedding_events
+    from modules.embedding_cache import open_cache, DEFAULT_CACHE_PATH
 except ImportError:
     print(
         "Warning: Some modules could not be imported. Using built-in implementations."
@@ -51,34 +57,48 @@ def fetch_publication(event_id: str, relay: str) -> Dict:
     Returns:
         The publication event
     """
-    # Decode NIP-19 identifiers if needed
+    # Decode NIP-19 identifiers in-process and build the matching filter.
+    # An naddr carries no event id - only (kind, pubkey, d tag) - so it
+    # needs a coordinate filter rather than an id lookup.
+    cmd = ["nak", "req"]
     if event_id.startswith(("nevent", "note", "naddr")):
         try:
-            process = subprocess.run(
-                ["nak", "decode", event_id],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True,
+            decoded = nip19_decode(event_id)
+        except Exception as e:
+            print(f"Error decoding event ID: {e}")
+            sys.exit(1)
+
+        if "id" in decoded:
+            cmd.extend(["-i", decoded["id"]])
+        elif "identifier" in decoded:
+            cmd.extend(
+                [
+                    "-k",
+                    str(decoded["kind"]),
+                    "-a",
+                    decoded["pubkey"],
+                    "-t",
+                    f"d={decoded['identifier']}",
+                ]
             )
-            decoded = json.loads(process.stdout.strip())
-            if "id" in decoded:
-                event_id = decoded["id"]
-        except subprocess.CalledProcessError as e:
-            print(f"Error decoding event ID: {e.stderr}")
+        else:
+            print(f"Error: {event_id} does not reference an event")
             sys.exit(1)
+    else:
+        cmd.extend(["-i", event_id])
+    cmd.append(relay)
 
     # Fetch the event using nak
     try:
         process = subprocess.run(
-            ["nak", "req", "-i", event_id, relay],
+            cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
             check=True,
         )
 
-        event = json.loads(process.stdout.strip())
+        event = _json.loads(process.stdout.strip())
 
         # Verify it's a publication event
         if event.get("kind") != 30040:
@@ -115,36 +135,81 @@ def extract_section_refs(pub_event: Dict) -> List[str]:
     return section_refs
 
 
-def fetch_section_events(section_ids: List[str], relay: str) -> List[Dict]:
+def _fetch_id_batch(id_batch: List[str], relay: str) -> Dict[str, Dict]:
+    """Fetch one batch of event IDs with a single nak req filter"""
+    cmd = ["nak", "req"]
+    for event_id in id_batch:
+        cmd.extend(["-i", event_id])
+    cmd.append(relay)
+
+    try:
+        process = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Failed to fetch sections: {e.stderr}")
+        return {}
+
+    # nak prints one event per line
+    events_by_id = {}
+    for line in process.stdout.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            event = _json.loads(line)
+            events_by_id[event["id"]] = event
+        except (_json.JSONDecodeError, KeyError):
+            print(f"Warning: Could not parse event: {line}")
+
+    return events_by_id
+
+
+def fetch_section_events(
+    section_ids: List[str], relay: str, max_parallel: int = 4, batch_size: int = 50
+) -> List[Dict]:
     """
-    Fetch section events by their IDs.
+    Fetch section events by their IDs with batched, concurrent relay queries.
+
+    IDs are grouped into batches of batch_size (relays commonly cap the
+    number of IDs per filter), and the batches are fetched concurrently.
 
     Args:
         section_ids: List of section event IDs
         relay: The relay URL
+        max_parallel: Maximum number of concurrent batch queries
+        batch_size: Maximum number of IDs per query
 
     Returns:
-        List of section events
+        List of section events, in the order of section_ids
     """
+    if not section_ids:
+        return []
+
+    batches = [
+        section_ids[i : i + batch_size]
+        for i in range(0, len(section_ids), batch_size)
+    ]
+
+    # Each batch is ~100% I/O-wait on the relay, so overlap them
+    events_by_id = {}
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(batches))) as pool:
+        for batch_result in pool.map(lambda b: _fetch_id_batch(b, relay), batches):
+            events_by_id.update(batch_result)
+
+    # Relays may return events in any order, so re-sort to match the
+    # index's section ordering
     section_events = []
-
     for section_id in section_ids:
-        try:
-            process = subprocess.run(
-                ["nak", "req", "-i", section_id, relay],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True,
-            )
-
-            section_event = json.loads(process.stdout.strip())
-            section_events.append(section_event)
-
-        except subprocess.CalledProcessError as e:
-            print(f"Failed to fetch section {section_id}: {e.stderr}")
-        except Exception as e:
-            print(f"Error processing section {section_id}: {e}")
+        event = events_by_id.get(section_id)
+        if event is not None:
+            section_events.append(event)
+        else:
+            print(f"Failed to fetch section {section_id}: not returned by relay")
 
     return section_events
 
@@ -160,6 +225,12 @@ def get_nevent_code(event: Dict, relay: str) -> str:
     Returns:
         The nevent code
     """
+    # Pure bech32 work - encode in-process instead of forking nak
+    try:
+        return encode_nevent(event["id"], [relay])
+    except Exception:
+        pass
+
     try:
         process = subprocess.run(
             ["nak", "encode", "nevent", "--relay", relay, event["id"]],
@@ -205,10 +276,30 @@ def main():
         default=10,
         help="Number of retries for failed event publications",
     )
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_CACHE_PATH,
+        help="Path to the embedding cache database ('' to disable)",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=["int8"],
+        help="Quantize embedding vectors (smaller vec tags, <1%% cosine loss)",
+    )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=4,
+        help="Maximum number of concurrent relay queries when fetching sections",
+    )
 
     args = parser.parse_args()
     print("reading key")
-    key = read_encrypted_key(args.nsec) if "ncryptsec" in args.nsec else args.nsec
+    # Resolve and decrypt once; every later create_event reuses the
+    # cached key instead of re-running the decrypt guard
+    key = ensure_key_loaded(
+        args.nsec, env_pw=os.environ.get("NOSTR_PASSWORD_VAR")
+    )
 
     # Fetch the publication
     print(f"Fetching publication {args.id} from {args.relay}...")
@@ -229,7 +320,9 @@ def main():
 
     # Fetch section events
     print("Fetching section events...")
-    section_events = fetch_section_events(section_ids, args.relay)
+    section_events = fetch_section_events(
+        section_ids, args.relay, max_parallel=args.max_parallel
+    )
     print(f"Fetched {len(section_events)} section events")
 
     events = []
@@ -238,31 +331,77 @@ def main():
         print(f"Creating traceback events for {len(section_events)} sections...")
         try:
             traceback_events = create_traceback_events_from_index(
-                pub_event, args.relay, key, decrypt=True
+                pub_event, args.relay, key, decrypt=False
             )
             events.extend(traceback_events)
         except Exception as e:
             print(f"Error creating traceback events: {e}")
 
-    elif args.mode == "embedding":
-        # Create embedding events
+    # Results from the encode/publish pipeline, when it ran
+    pipeline_results = None
+
+    if args.mode == "embedding":
         print(f"Creating embedding events using model {args.model}...")
-        for section in section_events:
+        cache = open_cache(args.cache)
+
+        if args.dry_run:
+            # Nothing to overlap with - one batched encode across sections
             try:
-                # Get section title
-                section_title = None
-                for tag in section.get("tags", []):
-                    if tag[0] == "title" and len(tag) > 1:
-                        section_title = tag[1]
-                        break
-
-                print(
-                    f"Creating embedding for section: {section_title or section['id'][:8]+'...'}"
+                embeddings = create_embedding_events(
+                    section_events,
+                    key,
+                    model=args.model,
+                    primary_relay=args.relay,
+                    quantize=args.quantize,
+                    cache=cache,
                 )
-                embedding = create_embedding_event(section, key, args.relay, args.model)
-                events.append(embedding)
+                events.extend(e for e in embeddings if e is not None)
             except Exception as e:
-                print(f"Error creating embedding: {e}")
+                print(f"Error creating embeddings: {e}")
+        else:
+            # Overlap encode and publish: encode releases the GIL in
+            # PyTorch while publishing waits on relay I/O, so chunk K
+            # publishes while chunk K+1 encodes. The bounded queue gives
+            # natural back-pressure.
+            done = object()
+            chunks = queue.Queue(maxsize=8)
+
+            def encoder_worker():
+                try:
+                    for i in range(0, len(section_events), 8):
+                        chunk = create_embedding_events(
+                            section_events[i : i + 8],
+                            key,
+                            model=args.model,
+                            primary_relay=args.relay,
+                            quantize=args.quantize,
+                            cache=cache,
+                        )
+                        chunks.put([e for e in chunk if e is not None])
+                except Exception as e:
+                    # Hand the failure to the main thread; swallowing it
+                    # here would quietly publish a truncated run
+                    chunks.put(e)
+                finally:
+                    chunks.put(done)
+
+            threading.Thread(target=encoder_worker, daemon=True).start()
+
+            print(f"\nPublishing events to {args.relay} as they are encoded...")
+            pipeline_results = []
+            while True:
+                chunk = chunks.get()
+                if chunk is done:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                if not chunk:
+                    continue
+                results = publish_events_batch(
+                    chunk, [args.relay], max_retries=args.retries, delay=args.delay
+                )
+                events.extend(chunk)
+                pipeline_results.extend(results)
 
     print(f"Created {len(events)} embedding events")
 
@@ -279,15 +418,19 @@ def main():
                 f"Model: {next((t[1] for t in event['tags'] if t[0] == 'model'), 'None')}"
             )
     else:
-        print(f"\nPublishing events to {args.relay}...")
         successful = 0
         nevent_codes = []
 
-        for i, event in enumerate(events, 1):
-            print(f"Publishing embedding {i}/{len(events)}...")
-            success = publish_event(
-                event, [args.relay], max_retries=args.retries, delay=args.delay
+        if pipeline_results is not None:
+            # Embedding mode already published while encoding
+            results = pipeline_results
+        else:
+            print(f"\nPublishing events to {args.relay}...")
+            # One nak invocation and one relay connection for the whole batch
+            results = publish_events_batch(
+                events, [args.relay], max_retries=args.retries, delay=args.delay
             )
+        for event, success in zip(events, results):
             if success:
                 successful += 1
                 nevent = get_nevent_code(event, args.relay)
@@ -295,10 +438,6 @@ def main():
             else:
                 nevent_codes.append((f"Failed: {event['id']}", False))
 
-            # Add a small delay between publications
-            if i < len(events):
-                time.sleep(1)
-
         # Print results
         print(
             f"\nEmbedding publication complete: {successful}/{len(events)} successful"
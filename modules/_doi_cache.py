@@ -0,0 +1,49 @@
+"""On-disk cache for Crossref work records, keyed by cleaned DOI.
+
+DOI metadata is effectively immutable on the timescale of a conversion
+run, so a cache hit replaces a Crossref round-trip with a local JSON
+read. Entries live under ~/.cache/nkbip_converter/crossref, sharded by
+the first two hex chars of the DOI's sha1, and expire after a TTL.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "nkbip_converter", "crossref"
+)
+
+DEFAULT_TTL = 30 * 86400  # DOI records barely change; a month is safe
+
+
+def _path_for(doi: str) -> str:
+    digest = hashlib.sha1(doi.encode("utf-8")).hexdigest()
+    return os.path.join(_CACHE_DIR, digest[:2], digest + ".json")
+
+
+def get(doi: str, ttl: int = DEFAULT_TTL):
+    """Return the cached work record for doi, or None on miss/expiry"""
+    try:
+        with open(_path_for(doi), "r") as f:
+            entry = json.load(f)
+        if time.time() - entry["ts"] > ttl:
+            return None
+        return entry["data"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def put(doi: str, payload: dict) -> None:
+    """Store a work record for doi; never raises on cache trouble"""
+    path = _path_for(doi)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so concurrent readers never see a torn file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"ts": time.time(), "data": payload}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
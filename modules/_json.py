@@ -0,0 +1,30 @@
+"""Shared JSON helpers for the hot event encode/decode paths.
+
+orjson parses Nostr-sized events several times faster than stdlib json
+and emits the compact separators Nostr serialization requires; fall
+back quietly to the stdlib when it isn't installed.
+"""
+
+try:
+    import orjson
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def dumps_bytes(obj) -> bytes:
+        # orjson already produces bytes; no str round trip
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    import json
+
+    def dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
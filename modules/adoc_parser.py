@@ -1,5 +1,19 @@
+import re
 from typing import List, Dict, Tuple
 
+# Level and title in one pass, compiled once; split(" ") allocates a
+# throwaway list per heading
+_HEADING_RE = re.compile(r"^(=+)\s+(.*)$")
+
+
+def _parse_heading(heading: str) -> Tuple[int, str]:
+    """Return (level, title) for a stripped heading line"""
+    m = _HEADING_RE.match(heading)
+    if m:
+        return len(m.group(1)), m.group(2).strip()
+    # Malformed heading (no separator after the = run)
+    return len(heading.split(" ")[0]), ""
+
 
 def parse_adoc_section(lines: List[str], start: int) -> Tuple[dict, int]:
     """Parse a section from the AsciiDoc content"""
@@ -7,12 +21,12 @@ def parse_adoc_section(lines: List[str], start: int) -> Tuple[dict, int]:
     current_line = start
     section_level = 0
     title = ""
+    heading = ""
 
     # Get section level and title
     if lines[start].startswith("="):
         heading = lines[start].strip()
-        section_level = len(heading.split(" ")[0])
-        title = heading.split(" ", 1)[1].strip() if " " in heading else ""
+        section_level, title = _parse_heading(heading)
         current_line += 1
 
     # Collect content until next section or end
@@ -24,63 +38,78 @@ def parse_adoc_section(lines: List[str], start: int) -> Tuple[dict, int]:
         content.append(line)
         current_line += 1
 
+    # Lines keep their own newlines, so concatenate them as-is; joining
+    # on "\n" doubled every line break in the stored content
     return {
         "title": title,
         "level": section_level,
-        "content": "\n".join(content).strip(),
+        "heading_line": heading,
+        "content": "".join(content).strip(),
     }, current_line
 
 
 def parse_adoc_file(file_path: str, debug=False) -> dict:
-    """Parse AsciiDoc file and return structured content"""
-    if debug:
-        print(f"\nDebug: Opening file {file_path}")
-    with open(file_path, "r") as f:
-        lines = f.readlines()
+    """Parse AsciiDoc file and return structured content.
 
+    Streams the file in a single pass, so memory stays O(largest
+    section) instead of holding the whole file as a list of lines.
+    """
     if debug:
-        print(f"Debug: File loaded, {len(lines)} lines")
-
-    # Skip header metadata (lines starting with :)
-    start_line = 0
-    while start_line < len(lines) and lines[start_line].startswith(":"):
-        if debug:
-            print(f"Debug: Skipping metadata line: {lines[start_line].strip()}")
-        start_line += 1
-
-    sections = []
-    current_line = start_line
+        print(f"\nDebug: Opening file {file_path}")
 
-    # Get document title from first level 1 heading
     title = ""
-    for line in lines:
-        if line.startswith("= "):
-            title = line[2:].strip()
+    sections: List[Dict] = []
+    current = None  # Section being accumulated, or None outside sections
+
+    def flush():
+        nonlocal current
+        if current is not None:
             if debug:
-                print(f"Debug: Found document title: {title}")
-            break
+                print(
+                    f"Debug: Adding section: {current['title']} (level {current['level']})"
+                )
+            sections.append(
+                {
+                    "title": current["title"],
+                    "level": current["level"],
+                    "heading_line": current["heading_line"],
+                    # Lines keep their own newlines; a plain concat is one
+                    # allocation and doesn't double every line break the
+                    # way joining on "\n" did
+                    "content": "".join(current["content"]).strip(),
+                }
+            )
+            current = None
 
-    if debug:
-        print("\nDebug: Processing sections...")
-    while current_line < len(lines):
-        line = lines[current_line]
-        if line.startswith("="):
-            level = len(line.split(" ")[0])  # Count the = signs
-            # Only process level 2 and deeper sections as content
-            if level >= 2:
-                if debug:
-                    print(f"Debug: Found heading: {line.strip()}")
-                section, current_line = parse_adoc_section(lines, current_line)
+    with open(file_path, "r") as f:
+        for line in f:
+            # Document title is the first level 1 heading
+            if not title and line.startswith("= "):
+                title = line[2:].strip()
                 if debug:
-                    print(
-                        f"Debug: Adding section: {section['title']} (level {section['level']})"
-                    )
-                    print(f"Debug: Content length: {len(section['content'])} chars")
-                sections.append(section)
-            else:
-                current_line += 1
-        else:
-            current_line += 1
+                    print(f"Debug: Found document title: {title}")
+
+            if line.startswith("="):
+                # Any heading ends the current section
+                flush()
+                level = len(line.split(" ")[0])
+                # Only level 2 and deeper sections carry content
+                if level >= 2:
+                    if debug:
+                        print(f"Debug: Found heading: {line.strip()}")
+                    heading = line.strip()
+                    heading_level, heading_title = _parse_heading(heading)
+                    current = {
+                        "title": heading_title,
+                        "level": heading_level,
+                        "heading_line": heading,
+                        "content": [],
+                    }
+            elif current is not None:
+                current["content"].append(line)
+
+    # Flush the last section at EOF
+    flush()
 
     result = {"title": title, "sections": sections}
 
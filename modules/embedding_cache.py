@@ -0,0 +1,86 @@
+"""Persistent on-disk cache for section embeddings.
+
+Embeddings are a pure function of (model, content), so re-running the
+embedder against an unchanged corpus can skip the encode entirely. The
+cache is a small sqlite database keyed by model name and the sha256 of
+the content; vectors are stored as raw float32 bytes.
+"""
+
+import hashlib
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.cache/nkbip_converter/embeddings.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    content_sha256 BLOB NOT NULL,
+    vec BLOB NOT NULL,
+    PRIMARY KEY (model, content_sha256)
+)
+"""
+
+
+def content_key(content: str) -> bytes:
+    """Cache key for a section content string"""
+    return hashlib.sha256(content.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """sqlite-backed (model, sha256(content)) -> vector cache"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # The cache is opened in the main thread but used from the
+        # encoder worker thread; access is serialized by that single
+        # worker, so sqlite's same-thread check only gets in the way
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def get_many(self, model: str, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Look up cached vectors; returns only the hits"""
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT content_sha256, vec FROM embeddings"
+            f" WHERE model = ? AND content_sha256 IN ({placeholders})",
+            [model, *keys],
+        )
+        return {
+            bytes(key): np.frombuffer(blob, dtype=np.float32)
+            for key, blob in rows
+        }
+
+    def put_many(self, model: str, items: Dict[bytes, np.ndarray]) -> None:
+        """Insert freshly computed vectors"""
+        if not items:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, content_sha256, vec)"
+            " VALUES (?, ?, ?)",
+            [
+                (model, key, vec.astype(np.float32).tobytes())
+                for key, vec in items.items()
+            ],
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_cache(path: Optional[str]) -> Optional[EmbeddingCache]:
+    """Open the cache at path, or return None (cache disabled) on failure"""
+    if not path:
+        return None
+    try:
+        return EmbeddingCache(path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: Could not open embedding cache {path}: {e}")
+        return None
@@ -6,6 +6,10 @@ import getpass
 import time
 import os
 
+from modules import _json
+from modules.event_signer import can_sign_in_process, get_pubkey_hex, sign_event
+from modules.key_utils import resolve_key
+
 
 _DECRYPTED_KEY = None
 
@@ -72,6 +76,55 @@ def decrypt_key(encrypted_key: str, env_pw: str = None) -> str:
 # Global decrypted key cache
 
 
+def ensure_key_loaded(key: str, env_pw: str = None) -> str:
+    """Resolve and decrypt the signing key exactly once, at startup.
+
+    Accepts a file path, an ncryptsec, or an already-usable key and
+    populates the module-level _DECRYPTED_KEY so every later
+    create_event call can pass decrypt=False and skip the guard.
+
+    Args:
+        key: Key material or path to a key file
+        env_pw: Name of environment variable containing the password
+
+    Returns:
+        The decrypted key
+    """
+    global _DECRYPTED_KEY
+    if _DECRYPTED_KEY is not None:
+        return _DECRYPTED_KEY
+
+    # Classify once: reads the key file (if any) a single time
+    kind, key = resolve_key(key)
+    if kind == "ncryptsec":
+        print("Decrypting key...")
+        key = decrypt_key(key, env_pw=env_pw)
+
+    _DECRYPTED_KEY = key
+    return _DECRYPTED_KEY
+
+
+def get_pubkey(key: str, env_pw: str = None) -> str:
+    """Derive the signing pubkey without creating an event.
+
+    Resolves and decrypts the key once (sharing the module cache), then
+    derives the x-only pubkey in-process when coincurve is available,
+    falling back to nak otherwise. Lets callers build complete tag
+    lists with self-references before signing anything.
+    """
+    privkey = ensure_key_loaded(key, env_pw=env_pw)
+    if can_sign_in_process(privkey):
+        return get_pubkey_hex(privkey)
+
+    process = subprocess.run(
+        ["nak", "key", "public", privkey], capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        print(f"Error deriving pubkey: {process.stderr}")
+        sys.exit(1)
+    return process.stdout.strip()
+
+
 def create_event(
     kind: int,
     content: str,
@@ -96,24 +149,20 @@ def create_event(
         elif _DECRYPTED_KEY is None:
             _DECRYPTED_KEY = ncryptsec
 
-        # Create the complete event
-        event = {
-            "kind": kind,
-            "content": content,
-            "tags": tags,
-            "created_at": int(time.time()),
-        }
-
-        # Convert to JSON - ensure no extra newlines
-        event_json = json.dumps(event, separators=(",", ":"))
-
         # Debug output
         if debug:
             print(f"Debug: Creating event with kind {kind}")
             print(f"Debug: Tags: {json.dumps(tags, indent=2)}")
-            print(f"Debug: Event JSON: {event_json}")
 
-        # Create the event with decrypted key using new nak syntax
+        # Sign in-process when possible: no fork per event, and large
+        # tag values (base64 vectors) never hit argv limits
+        if can_sign_in_process(_DECRYPTED_KEY):
+            result_event = sign_event(_DECRYPTED_KEY, kind, content, tags)
+            if debug:
+                print(f"Debug: Event signed in-process with ID: {result_event['id']}")
+            return result_event
+
+        # Fall back to creating the event via nak
         cmd = ["nak", "event", "--sec", _DECRYPTED_KEY, "--kind", str(kind), "--content", content]
         
         # Add tags using the new format
@@ -138,7 +187,7 @@ def create_event(
             print(f"Debug: stderr: {process.stderr}")
             raise Exception(f"Command failed: {process.stderr}")
 
-        result_event = json.loads(process.stdout)
+        result_event = _json.loads(process.stdout)
         if debug:
             print(f"Debug: Event created successfully with ID: {result_event['id']}")
             print(f"Debug: Event tags: {json.dumps(result_event['tags'], indent=2)}")
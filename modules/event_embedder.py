@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
 from sentence_transformers import SentenceTransformer
 from .event_creator import create_event
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pprint
-import base64
+
+# pybase64 is a drop-in binascii replacement backed by SIMD libbase64;
+# encoding a 1536-byte vector drops from ~5us to <1us where available
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 
 _MODEL = None
@@ -29,6 +38,12 @@ def extract_vector_embedding(event):
             # Decode the base64 string to bytes
             binary_data = base64.b64decode(base64_string)
 
+            # Quantized form: ["vec", b64, "int8", "<scale>"]
+            if len(tag) >= 4 and tag[2] == "int8":
+                scale = float(tag[3])
+                q = np.frombuffer(binary_data, dtype=np.int8)
+                return q.astype(np.float32) / scale
+
             # Convert bytes to float32 array
             float_array = np.frombuffer(binary_data, dtype=np.float32)
 
@@ -61,31 +76,101 @@ def create_vector_tag(embedding_array):
     return ["vec", base64_string]
 
 
+def create_vector_tag_int8(embedding_array, scale=127):
+    """
+    Convert a normalized embedding to an int8-quantized Nostar tag
+
+    Values are scaled by `scale` and rounded; for normalized embeddings
+    this loses <1% cosine similarity while cutting the payload 4x.
+
+    Args:
+        embedding_array (numpy.ndarray): The vector embedding array
+        scale (int): Quantization scale factor
+
+    Returns:
+        list: A Nostar tag with the quantized embedding and its scale
+    """
+    q = np.clip(np.round(embedding_array * scale), -scale, scale).astype(np.int8)
+    base64_string = base64.b64encode(q.tobytes()).decode("ascii")
+    return ["vec", base64_string, "int8", str(scale)]
+
+
 def set_model(model):
-    global _MODEL
+    global _MODEL, _DIMENSION
     _MODEL = SentenceTransformer(model)
+    # Read the dimension from the model so the dims tag stays correct
+    # for models other than the 384-dim default
+    _DIMENSION = _MODEL.get_sentence_embedding_dimension()
 
 
-def create_embedding_event(
-    section_event, key, decrypt=True, model="all-MiniLM-L6-v2", primary_relay=None
+# Worker-process model handle for encode_batch_parallel
+_WORKER_MODEL = None
+
+
+def _worker_init(model_name):
+    global _WORKER_MODEL
+    _WORKER_MODEL = SentenceTransformer(model_name)
+
+
+def _worker_encode(contents):
+    return _WORKER_MODEL.encode(
+        contents, batch_size=32, normalize_embeddings=True
+    )
+
+
+# Below this many contents the per-worker model load costs more than the
+# parallelism saves
+_PARALLEL_THRESHOLD = 64
+
+
+def encode_batch_parallel(contents, model_name, n_workers=None):
+    """Encode a large batch across worker processes, one model copy each.
+
+    On CPU a single encode call is limited by PyTorch's intra-op
+    parallelism, which stops scaling past a few cores; sharding the batch
+    across processes scales nearly linearly. Falls back to the in-process
+    model for small batches where worker startup would dominate.
+    """
+    global _MODEL
+    if len(contents) < _PARALLEL_THRESHOLD:
+        if _MODEL is None:
+            set_model(model_name)
+        return _MODEL.encode(contents, batch_size=32, normalize_embeddings=True)
+
+    if n_workers is None:
+        n_workers = min(os.cpu_count() or 1, 8)
+
+    chunk_size = -(-len(contents) // n_workers)  # ceil division
+    chunks = [
+        contents[i : i + chunk_size] for i in range(0, len(contents), chunk_size)
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=len(chunks), initializer=_worker_init, initargs=(model_name,)
+    ) as pool:
+        results = list(pool.map(_worker_encode, chunks))
+
+    return np.concatenate(results)
+
+
+def create_embedding_event_from_vector(
+    section_event, embedding, key, decrypt=True, model="all-MiniLM-L6-v2",
+    primary_relay=None, quantize=None
 ):
+    """Build and sign a kind 1987 event from an already-computed embedding"""
     event_id = section_event["id"]
     tags = []
     try:
-        global _MODEL
-        if _MODEL is None and model:
-            set_model(model)
-
-        # Create the embedding
-        content = section_event["content"]
-        embedding = _MODEL.encode(content, normalize_embeddings=True)
         if primary_relay:
             tags.append(["e", event_id, primary_relay])
         else:
             tags.append(["e", event_id])
         tags.append(["model", model])
         tags.append(["dims", str(_DIMENSION)])
-        tags.append(create_vector_tag(embedding))
+        if quantize == "int8":
+            tags.append(create_vector_tag_int8(embedding))
+        else:
+            tags.append(create_vector_tag(embedding))
         tags.append(["norm", "true"])
         created_event = create_event(1987, "", tags, key, decrypt)
         return created_event
@@ -94,6 +179,96 @@ def create_embedding_event(
         return None
 
 
+def create_embedding_event(
+    section_event, key, decrypt=True, model="all-MiniLM-L6-v2", primary_relay=None
+):
+    event_id = section_event["id"]
+    try:
+        global _MODEL
+        if _MODEL is None and model:
+            set_model(model)
+
+        # Create the embedding
+        content = section_event["content"]
+        embedding = _MODEL.encode(content, normalize_embeddings=True)
+        return create_embedding_event_from_vector(
+            section_event, embedding, key, decrypt, model, primary_relay
+        )
+    except Exception as e:
+        print(f"Error creating embedding: {e}")
+        return None
+
+
+def create_embedding_events(
+    section_events, key, decrypt=True, model="all-MiniLM-L6-v2",
+    primary_relay=None, quantize=None, cache=None
+):
+    """Create kind 1987 events for many sections with one batched encode.
+
+    SentenceTransformer.encode amortizes tokenizer and kernel-launch
+    overhead across a batch, so encoding all section contents in one call
+    is much faster than one encode per section. An optional
+    EmbeddingCache serves vectors for unchanged contents so repeat runs
+    only encode what actually changed.
+    """
+    if not section_events:
+        return []
+
+    global _MODEL, _DIMENSION
+
+    # Drop empty sections and encode each distinct content exactly once;
+    # encoding dominates CPU, so duplicates (shared boilerplate) are a
+    # pure waste. The sha256 digest doubles as the cache key.
+    kept = []
+    unique = {}
+    for section in section_events:
+        content = section["content"]
+        if not content.strip():
+            print(f"Skipping empty section {section['id'][:8]}...")
+            continue
+        digest = hashlib.sha256(content.encode("utf-8")).digest()
+        kept.append((section, digest))
+        if digest not in unique:
+            unique[digest] = content
+
+    if not unique:
+        return []
+
+    vector_by_digest = {}
+    if cache is not None:
+        vector_by_digest = cache.get_many(model, list(unique))
+        if vector_by_digest:
+            print(f"Embedding cache: {len(vector_by_digest)}/{len(unique)} hits")
+
+    misses = [digest for digest in unique if digest not in vector_by_digest]
+    if misses:
+        # Shards across worker processes for large batches, otherwise
+        # encodes with the shared in-process model
+        vectors = encode_batch_parallel(
+            [unique[digest] for digest in misses], model
+        )
+        if len(vectors):
+            # The pool path never loads the model in this process, so
+            # take the dimension from the vectors themselves
+            _DIMENSION = len(vectors[0])
+        fresh = dict(zip(misses, vectors))
+        vector_by_digest.update(fresh)
+        if cache is not None:
+            cache.put_many(model, fresh)
+    else:
+        # Fully served from cache - the model never loads, so take the
+        # dimension from the stored vectors
+        _DIMENSION = len(next(iter(vector_by_digest.values())))
+
+    return [
+        create_embedding_event_from_vector(
+            section, vector_by_digest[digest], key, decrypt, model,
+            primary_relay, quantize
+        )
+        for section, digest in kept
+    ]
+
+
 def main():
     section_event = {
         "kind": 30041,
@@ -1,14 +1,25 @@
 import subprocess
 from typing import List, Dict
 
+from modules.nip19 import encode_nevent, encode_naddr
+
 
 def encode_event_id(event: Dict, relays: List[str], note_format: bool = False) -> str:
-    """Encode an event ID to naddr/nevent format using nak
+    """Encode an event ID to naddr/nevent format
     Args:
         event: The event to encode
         relays: List of relay hints
         note_format: Whether to use nevent format
     """
+    # Encode in-process; this is pure bech32 work, no need to fork nak
+    try:
+        if note_format:
+            return encode_nevent(event["id"], relays, author=event["pubkey"])
+        d_tag = next(tag[1] for tag in event["tags"] if tag[0] == "d")
+        return encode_naddr(event["kind"], event["pubkey"], d_tag, relays)
+    except Exception as e:
+        print(f"Debug: In-process encoding failed ({e}), falling back to nak")
+
     try:
         # Build base command
         cmd = ["nak", "encode"]
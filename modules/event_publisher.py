@@ -1,8 +1,11 @@
 from typing import List
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import json
 import time
 
+from modules import _json
+
 
 def publish_event(
     event: dict, relays: List[str], max_retries: int = 3, delay: int = 0
@@ -10,7 +13,8 @@ def publish_event(
     """Publish an event to specified relays using nak"""
     try:
         print(f"\nDebug: Publishing event {event['id']} to relays: {relays}")
-        event_str = json.dumps(event)
+        # Serialize straight to bytes; no intermediate str + encode pass
+        event_bytes = _json.dumps_bytes(event)
 
         # Create command with relays appended
         cmd = ["nak", "event"] + relays
@@ -28,7 +32,7 @@ def publish_event(
             # Create and publish the event
             result = subprocess.run(
                 cmd,
-                input=event_str.encode("utf-8"),
+                input=event_bytes,
                 capture_output=True,
                 timeout=30,  # Longer timeout for publishing
             )
@@ -41,24 +45,11 @@ def publish_event(
                     print(f"Debug: Retrying after {delay} seconds...")
                     time.sleep(delay)
             else:
+                # nak surfaces the relay's OK frame (NIP-20) itself; a
+                # follow-up REQ doubles the traffic and is racy, so trust
+                # the acknowledged publish
                 print("Debug: Event published successfully")
-
-                # Verify publication by requesting event
-                verify_cmd = ["nak", "req", "-i", event["id"]] + relays
-                print(f"Debug: Verifying with command: {' '.join(verify_cmd)}")
-
-                verify_result = subprocess.run(
-                    verify_cmd, capture_output=True, timeout=10
-                )
-
-                if verify_result.returncode == 0 and verify_result.stdout:
-                    print("Debug: Event verified on relay")
-                    success = True
-                else:
-                    print("Debug: Could not verify event on relay")
-                    if attempts < max_retries:
-                        print(f"Debug: Retrying after {delay} seconds...")
-                        time.sleep(delay)
+                success = True
 
         print("Publish successful, adding delay before next event...")
         time.sleep(delay)
@@ -70,3 +61,94 @@ def publish_event(
     except Exception as e:
         print(f"Error publishing event: {e}")
         return False
+
+
+def publish_events_batch(
+    events: List[dict], relays: List[str], max_retries: int = 3, delay: int = 0
+) -> List[bool]:
+    """Publish a whole batch of events through one nak invocation.
+
+    nak reads newline-delimited event JSON from stdin and publishes every
+    event over a single relay connection, so the batch costs one fork and
+    one websocket handshake instead of two per event. Events that don't
+    come back in nak's output are retried up to max_retries times.
+
+    Returns a list of success flags in the same order as events.
+    """
+    if not events:
+        return []
+
+    pending = {event["id"]: event for event in events}
+
+    for attempt in range(1, max_retries + 1):
+        batch = list(pending.values())
+        print(
+            f"Debug: Publishing batch of {len(batch)} event(s) to {relays}"
+            f" (attempt {attempt} of {max_retries})"
+        )
+        # Build the stdin payload as bytes up front so the pipe write
+        # doesn't re-encode a batch-sized str
+        payload = b"\n".join(_json.dumps_bytes(event) for event in batch) + b"\n"
+
+        try:
+            result = subprocess.run(
+                ["nak", "event"] + relays,
+                input=payload,
+                capture_output=True,
+                timeout=30 + 5 * len(batch),
+            )
+        except subprocess.TimeoutExpired:
+            print("Error: Batch publishing timed out")
+            continue
+        except Exception as e:
+            print(f"Error publishing batch: {e}")
+            continue
+
+        # nak echoes each accepted event as a JSON line on stdout
+        for line in result.stdout.decode("utf-8", "replace").splitlines():
+            line = line.strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                echoed = _json.loads(line)
+            except _json.JSONDecodeError:
+                continue
+            pending.pop(echoed.get("id"), None)
+
+        if not pending:
+            break
+        print(f"Debug: {len(pending)} event(s) not acknowledged")
+        if result.returncode != 0:
+            print(f"Debug: stderr: {result.stderr.decode('utf-8', 'replace')}")
+        if attempt < max_retries and delay:
+            print(f"Debug: Retrying after {delay} seconds...")
+            time.sleep(delay)
+
+    return [event["id"] not in pending for event in events]
+
+
+def publish_events(
+    events: List[dict],
+    relays: List[str],
+    max_workers: int = 8,
+    max_retries: int = 3,
+    delay: int = 0,
+) -> List[bool]:
+    """Publish a batch of events concurrently.
+
+    Publishing is network-bound (one nak round trip per event), so running
+    the per-event publishes through a bounded thread pool makes the batch
+    cost ~max(latency) instead of sum(latency).
+
+    Returns a list of success flags in the same order as events.
+    """
+    if not events:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(events))) as pool:
+        return list(
+            pool.map(
+                lambda event: publish_event(event, relays, max_retries, delay),
+                events,
+            )
+        )
@@ -0,0 +1,105 @@
+"""In-process Nostr event signing (NIP-01 id + BIP-340 Schnorr signature).
+
+Signing through nak forks one subprocess per event and pushes every tag
+through argv, which breaks on very large values (base64 vector tags).
+When coincurve is available, events are serialized, hashed and signed
+entirely in-process; callers fall back to the nak path otherwise.
+"""
+
+from typing import Dict, List, Optional
+import functools
+import hashlib
+import json
+import time
+
+try:
+    import coincurve
+
+    HAVE_COINCURVE = True
+except ImportError:
+    HAVE_COINCURVE = False
+
+# orjson serializes straight to bytes, so the payload goes into sha256
+# without an intermediate str -> bytes copy
+try:
+    import orjson
+
+    def _serialize(payload) -> bytes:
+        return orjson.dumps(payload)
+except ImportError:
+
+    def _serialize(payload) -> bytes:
+        return json.dumps(
+            payload, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=8)
+def _private_key(privkey_hex: str):
+    """One coincurve.PrivateKey per key, reused across a whole batch"""
+    return coincurve.PrivateKey(bytes.fromhex(privkey_hex))
+
+
+def get_pubkey_hex(privkey_hex: str) -> str:
+    """Derive the x-only (32-byte) public key hex for a private key"""
+    pubkey = _private_key(privkey_hex).public_key
+    # Nostr uses the x coordinate only (drop the 02/03 parity byte)
+    return pubkey.format(compressed=True)[1:].hex()
+
+
+def compute_event_id(
+    pubkey: str, created_at: int, kind: int, tags: List[List[str]], content: str
+) -> str:
+    """Compute the NIP-01 event id: sha256 of the canonical serialization"""
+    payload = _serialize([0, pubkey, created_at, kind, tags, content])
+    return hashlib.sha256(payload).hexdigest()
+
+
+def sign_event(
+    privkey_hex: str,
+    kind: int,
+    content: str,
+    tags: List[List[str]],
+    created_at: Optional[int] = None,
+) -> Dict:
+    """Create and sign a complete Nostr event in-process.
+
+    Args:
+        privkey_hex: 64-char hex private key
+        kind: Event kind
+        content: Event content
+        tags: Event tags
+        created_at: Unix timestamp (defaults to now)
+
+    Returns:
+        The signed event dictionary
+    """
+    if created_at is None:
+        created_at = int(time.time())
+
+    pubkey = get_pubkey_hex(privkey_hex)
+    event_id = compute_event_id(pubkey, created_at, kind, tags, content)
+    sig = _private_key(privkey_hex).sign_schnorr(bytes.fromhex(event_id)).hex()
+
+    return {
+        "id": event_id,
+        "pubkey": pubkey,
+        "created_at": created_at,
+        "kind": kind,
+        "tags": tags,
+        "content": content,
+        "sig": sig,
+    }
+
+
+def can_sign_in_process(privkey: str) -> bool:
+    """True when the key is plain hex and the signing backend is available"""
+    if not HAVE_COINCURVE:
+        return False
+    if len(privkey) != 64:
+        return False
+    try:
+        bytes.fromhex(privkey)
+        return True
+    except ValueError:
+        return False
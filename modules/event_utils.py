@@ -1,3 +1,5 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from .event_creator import create_event, create_a_tag
 
@@ -24,21 +26,28 @@ def get_title_from_tags(tags: List[List[str]]) -> str:
     Expected format: tags is a list of lists, where each inner list is [tag_name, tag_value]
     e.g., [['title', 'My Title'], ['d', 'my-tag']]
     """
-    print(f"Debug: Processing tags for title: {tags}")
+    # repr of the full tag list is expensive for events with many a
+    # tags, so only build it when debugging is on
+    if os.environ.get("NKBIP_DEBUG"):
+        print(f"Debug: Processing tags for title: {tags}")
 
-    # Look for title tag
+    # One pass: return the first title tag, remembering the first d tag
+    # as the fallback
+    d_fallback = None
     for tag in tags:
-        if len(tag) >= 2 and tag[0] == "title":
+        if len(tag) < 2:
+            continue
+        if tag[0] == "title":
             return tag[1]
+        if tag[0] == "d" and d_fallback is None:
+            d_fallback = tag[1]
 
-    # If no title tag found, try to extract from d tag
-    for tag in tags:
-        if len(tag) >= 2 and tag[0] == "d":
-            parts = tag[1].split("-")  # Split on hyphens
-            if parts:
-                # Take the last segment and clean it up
-                title = " ".join(parts[-1].split("-")).title()
-                return title
+    # If no title tag found, try to extract from the d tag
+    if d_fallback is not None:
+        parts = d_fallback.split("-")  # Split on hyphens
+        if parts:
+            # Take the last segment and clean it up
+            return " ".join(parts[-1].split("-")).title()
 
     return "Untitled"
 
@@ -50,11 +59,22 @@ def create_traceback_event(link_a_tag, parent_a_tag, primary_relay, key, decrypt
 
 
 def create_traceback_events_from_index(index_event, primary_relay, key, decrypt=False):
-    events = []
     index_a_tag = create_a_tag(index_event, primary_relay)
-    for tag in index_event["tags"]:
-        if tag[0] == "a":
-            events.append(
-                create_traceback_event(tag, index_a_tag, primary_relay, key, decrypt)
+    a_tags = [tag for tag in index_event["tags"] if tag[0] == "a"]
+    if not a_tags:
+        return []
+
+    # One traceback per chapter is independent of the rest, so sign them
+    # concurrently: the Schnorr sign releases the GIL in-process and the
+    # nak fallback just waits on a subprocess. Threads rather than a
+    # process pool because the decrypted key lives in process state.
+    workers = min(os.cpu_count() or 1, len(a_tags))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(
+                lambda tag: create_traceback_event(
+                    tag, index_a_tag, primary_relay, key, decrypt
+                ),
+                a_tags,
             )
-    return events
+        )
@@ -1,35 +1,99 @@
+import os
 import subprocess
 import sys
 import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List
 
+from modules import _json
+from modules.event_signer import compute_event_id
+from modules.nak_daemon import get_daemon
 
-def verify_event(event: dict, debug: bool = False) -> bool:
-    """Verify a Nostr event using nak"""
+# The verification itself is microseconds of sha256 + Schnorr work;
+# forking nak per event costs orders of magnitude more
+try:
+    import coincurve
+
+    _HAVE_COINCURVE = True
+except ImportError:
+    _HAVE_COINCURVE = False
+
+
+def _verify_event_native(event: dict, debug: bool = False) -> bool:
+    """Verify the event id and BIP-340 signature in-process"""
+    expected_id = compute_event_id(
+        event["pubkey"],
+        event["created_at"],
+        event["kind"],
+        event["tags"],
+        event["content"],
+    )
+    if expected_id != event["id"]:
+        print("Debug: Verification failed: event id does not match content")
+        return False
+
+    verified = coincurve.PublicKeyXOnly(bytes.fromhex(event["pubkey"])).verify(
+        bytes.fromhex(event["sig"]), bytes.fromhex(event["id"])
+    )
+    if not verified:
+        print("Debug: Verification failed: invalid signature")
+    elif debug:
+        print("Debug: Event verified successfully")
+    return verified
+
+
+def verify_event(event: dict, debug: bool = False, use_native: bool = True) -> bool:
+    """Verify a Nostr event in-process, falling back to nak"""
     try:
         if debug:
             print("\nDebug: Verifying event:")
             print(f"Debug: Event ID: {event['id']}")
 
-        result = subprocess.run(
-            ["nak", "verify"],
-            input=json.dumps(event).encode(),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=10,
-        )
+        if use_native and _HAVE_COINCURVE:
+            return _verify_event_native(event, debug)
 
-        if result.returncode != 0:
+        # Fallback goes through the shared daemon wrapper: if the
+        # installed nak ever grows a streaming verify loop, the pipe is
+        # set up once and reused instead of forking per event
+        try:
+            get_daemon().call(["verify"], _json.dumps(event))
+        except ValueError as e:
             print("Debug: Verification failed:")
-            print(f"Debug: stdout: {result.stdout.decode()}")
-            print(f"Debug: stderr: {result.stderr.decode()}")
-        else:
-            if debug:
-                print("Debug: Event verified successfully")
-
-        return result.returncode == 0
-    except subprocess.TimeoutExpired:
-        print("Error: Verification timed out")
-        return False
+            print(f"Debug: {e}")
+            return False
+
+        if debug:
+            print("Debug: Event verified successfully")
+        return True
     except Exception as e:
         print(f"Error verifying event: {e}")
         return False
+
+
+def _verify_one(event: dict) -> bool:
+    """Top-level (picklable) single-event verify for pool workers"""
+    return verify_event(event)
+
+
+def verify_events(events: List[dict], debug: bool = False, workers: int = None) -> List[bool]:
+    """Verify a batch of events in parallel.
+
+    Verification is embarrassingly parallel. With the native path,
+    libsecp1256k1 releases the GIL, so threads verify truly concurrently
+    without per-task process overhead; without it, a process pool
+    overlaps the nak subprocess waits instead.
+
+    Returns success flags in the same order as events.
+    """
+    if not events:
+        return []
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(events))
+
+    if _HAVE_COINCURVE:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_verify_one, events))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_verify_one, events, chunksize=8))
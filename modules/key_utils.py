@@ -1,10 +1,28 @@
 import os
 import getpass
+from typing import Tuple
 
 def read_encrypted_key(key_path: str) -> str:
     """Read and validate the encrypted key file"""
     if not os.path.isfile(key_path):
         raise ValueError(f"Key file not found: {key_path}")
-        
+
     with open(key_path, 'r') as f:
-        return f.read().strip()
\ No newline at end of file
+        return f.read().strip()
+
+def resolve_key(arg: str) -> Tuple[str, str]:
+    """Resolve a key argument to (kind, material).
+
+    Accepts a file path, an ncryptsec, an nsec or plain hex, reading the
+    file exactly once when given a path. kind is one of 'ncryptsec',
+    'nsec' or 'hex' so callers can decide whether decryption is needed
+    without substring-sniffing what may be a file path.
+    """
+    if os.path.isfile(arg):
+        arg = read_encrypted_key(arg)
+
+    if arg.startswith('ncryptsec1'):
+        return 'ncryptsec', arg
+    if arg.startswith('nsec1'):
+        return 'nsec', arg
+    return 'hex', arg
\ No newline at end of file
@@ -1,27 +1,61 @@
-import re
+# Prefer the RE2 engine when installed: linear-time matching with no
+# catastrophic backtracking, which matters when converting untrusted
+# markdown. The patterns here use no backrefs, so both engines agree.
+try:
+    import re2 as re
+except ImportError:
+    import re
 from typing import Dict
 
+# One alternation covering every construct, compiled once at import.
+# Alternatives are tried in order at each position, so fences win over
+# the inline-code rule and nothing inside a fence is rewritten.
+_TOKEN = re.compile(
+    r'(?P<header>^(?P<hashes>#{1,3}) (?P<htext>[^\n]*)$)'
+    r'|(?P<fence>```(?P<lang>\w+)?\n(?P<code>.*?)\n```)'
+    r'|(?P<inline>`[^`]+`)'
+    r'|(?P<bold>\*\*[^\*]+\*\*)'
+    r'|(?P<italic>_[^_]+_)'
+    r'|(?P<link>\[(?P<ltext>[^\]\n]*)\]\((?P<lurl>[^)\n]*)\))',
+    re.MULTILINE | re.DOTALL,
+)
+
+def _render(text: str, out: list) -> None:
+    """Tokenize text once, appending converted pieces to out"""
+    pos = 0
+    for m in _TOKEN.finditer(text):
+        out.append(text[pos:m.start()])
+        if m.group('header') is not None:
+            # # -> =, ## -> ==, ### -> ===; the heading text can carry
+            # inline constructs of its own, so render it recursively
+            out.append('=' * len(m.group('hashes')) + ' ')
+            _render(m.group('htext'), out)
+        elif m.group('fence') is not None:
+            lang = m.group('lang') or ''
+            out.append(f"[source,{lang}]\n----\n{m.group('code')}\n----")
+        elif m.group('inline') is not None or m.group('italic') is not None:
+            # Inline code and italic are already valid AsciiDoc, so they
+            # pass through untouched. The inline-code alternative still
+            # has to exist as a token (unlike the old identity re.sub
+            # pass, which only burned a scan): it stops the emphasis and
+            # link rules from rewriting text inside backticks.
+            out.append(m.group())
+        elif m.group('bold') is not None:
+            out.append('*' + m.group('bold')[2:-2] + '*')  # bold to strong
+        else:
+            out.append(f"{m.group('ltext')} <{m.group('lurl')}>")
+        pos = m.end()
+    out.append(text[pos:])
+
+
 def convert_md_to_adoc(markdown_text: str) -> str:
     """Convert markdown to AsciiDoc format"""
-    # Convert headers
-    text = re.sub(r'^# (.*)', r'= \1', markdown_text, flags=re.MULTILINE)
-    text = re.sub(r'^## (.*)', r'== \1', text, flags=re.MULTILINE)
-    text = re.sub(r'^### (.*)', r'=== \1', text, flags=re.MULTILINE)
-    
-    # Convert code blocks
-    text = re.sub(r'```(\w+)?\n(.*?)\n```', r'[source,\1]\n----\n\2\n----', text, flags=re.MULTILINE | re.DOTALL)
-    
-    # Convert inline code
-    text = re.sub(r'`([^`]+)`', r'`\1`', text)
-    
-    # Convert links
-    text = re.sub(r'\[(.*?)\]\((.*?)\)', r'\1 <\2>', text)
-    
-    # Convert emphasis
-    text = re.sub(r'\*\*([^\*]+)\*\*', r'*\1*', text)  # bold to strong
-    text = re.sub(r'_([^_]+)_', r'_\1_', text)  # italic remains italic
-    
-    return text
+    # Single tokenizing pass: walk the text once, copy the gaps between
+    # matches verbatim and emit the converted form of each construct,
+    # instead of rescanning and reallocating the whole text per rule
+    out = []
+    _render(markdown_text, out)
+    return ''.join(out)
 
 def merge_markdown_into_adoc(markdown_path: str, adoc_content: Dict) -> Dict:
     """Read markdown file, convert it to AsciiDoc, and merge it into the document"""
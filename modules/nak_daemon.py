@@ -0,0 +1,92 @@
+"""Single entry point for running nak commands, with daemon reuse when
+the installed nak supports it.
+
+Released nak builds expose no REPL/stdin command loop, so a persistent
+child can't replace fork+exec per call today; the hot per-event paths
+avoid the fork instead (in-process signing, nip19 codec, batched
+publish/req). This module centralizes the remaining call sites behind
+one API: it probes once for a `nak serve`-style loop and pipelines
+commands through it when present, otherwise falls back to one
+subprocess per call.
+"""
+
+import atexit
+import shutil
+import subprocess
+import threading
+from typing import List, Optional
+
+
+class NakDaemon:
+    """Runs nak commands, reusing a persistent child when nak offers one"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._proc = None
+        self._probed = False
+
+    def _probe(self) -> None:
+        """Check once whether nak has a stdin command loop to keep alive"""
+        self._probed = True
+        if not shutil.which("nak"):
+            return
+        try:
+            help_text = subprocess.run(
+                ["nak", "--help"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except Exception:
+            return
+        # No released nak exposes a repl/shell subcommand yet; if one
+        # appears it will be listed in the top-level help
+        for name in ("repl", "shell"):
+            if f"\n   {name} " in help_text or f"\n  {name} " in help_text:
+                self._proc = subprocess.Popen(
+                    ["nak", name],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                    bufsize=1,
+                )
+                atexit.register(self._proc.terminate)
+                break
+
+    def call(self, command_args: List[str], input_data: Optional[str] = None) -> str:
+        """Run one nak command and return its stdout.
+
+        Raises ValueError with nak's stderr on failure, matching
+        run_nak_command's contract.
+        """
+        with self._lock:
+            if not self._probed:
+                self._probe()
+            if self._proc is not None and self._proc.poll() is None and not input_data:
+                # Line protocol: one command in, one result line out
+                self._proc.stdin.write(" ".join(command_args) + "\n")
+                self._proc.stdin.flush()
+                return self._proc.stdout.readline().strip()
+
+        result = subprocess.run(
+            ["nak"] + command_args,
+            input=input_data,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise ValueError(
+                f"Failed to run nak {' '.join(command_args)}: {result.stderr}"
+            )
+        return result.stdout.strip()
+
+
+# Process-wide singleton so every caller shares one probe (and one
+# daemon, when available)
+_DAEMON = None
+_DAEMON_LOCK = threading.Lock()
+
+
+def get_daemon() -> NakDaemon:
+    global _DAEMON
+    with _DAEMON_LOCK:
+        if _DAEMON is None:
+            _DAEMON = NakDaemon()
+        return _DAEMON
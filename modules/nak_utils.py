@@ -1,9 +1,62 @@
+import functools
 import subprocess
 import json
 import shlex
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Optional, Dict, List, Union, Any
 
+from modules.nak_daemon import get_daemon
+from modules import nip19
+from modules import _json
 
+
+def _fanout_relays(
+    base_args: List[str], relays: List[str], tail_args: List[str] = None
+) -> List[Dict]:
+    """Query each relay concurrently and merge the results.
+
+    One nak call per relay, overlapped in threads, turns total wall time
+    from the sum of relay latencies into roughly the slowest one. Events
+    are deduped by id, keeping first-seen order.
+
+    nak stops parsing flags at the first positional argument, so
+    base_args must contain flags only; positionals (like the entity for
+    nak fetch) go in tail_args, after the per-relay --relay flag.
+    """
+    tail = tail_args or []
+
+    def one(relay: str) -> List[Dict]:
+        try:
+            output = get_daemon().call(base_args + ["--relay", relay] + tail)
+        except ValueError:
+            return []
+        events = []
+        for line in output.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(_json.loads(line))
+            except _json.JSONDecodeError:
+                continue
+        return events
+
+    merged = []
+    seen = set()
+    with ThreadPoolExecutor(max_workers=len(relays)) as pool:
+        for events in pool.map(one, relays):
+            for event in events:
+                event_id = event.get("id") if isinstance(event, dict) else None
+                if event_id is not None and event_id in seen:
+                    continue
+                if event_id is not None:
+                    seen.add(event_id)
+                merged.append(event)
+    return merged
+
+
+@functools.lru_cache(maxsize=8192)
 def nak_decode(npub_or_entity: str) -> json:
     """
     Decode a Nostr NIP-19 entity (like npub) to its raw hex form using NAK.
@@ -18,8 +71,22 @@ def nak_decode(npub_or_entity: str) -> json:
         subprocess.CalledProcessError: If NAK decode fails
         ValueError: If the output format isn't as expected
     """
+    # Decode in-process: bech32 is a few hundred bytes of arithmetic,
+    # not worth a fork. Known prefixes never touch nak.
+    try:
+        if npub_or_entity.startswith("npub"):
+            return nip19.decode(npub_or_entity)
+        elif npub_or_entity.startswith("note"):
+            return {"event_id": nip19.decode(npub_or_entity)["id"]}
+        elif npub_or_entity.startswith("nsec"):
+            return nip19.decode(npub_or_entity)["private_key"]
+        elif npub_or_entity.startswith(("nevent", "naddr", "nprofile")):
+            return nip19.decode(npub_or_entity)
+    except ValueError as e:
+        raise ValueError(f"Failed to decode {npub_or_entity}: {e}")
+
+    # Unknown prefix - let nak have a go
     try:
-        # Call the NAK command-line tool, returns json
         result = subprocess.run(
             ["nak", "decode", npub_or_entity],
             capture_output=True,
@@ -27,27 +94,19 @@ def nak_decode(npub_or_entity: str) -> json:
             check=True,
         )
 
-        # Parse the output
         output = result.stdout.strip()
 
-        # Handle different formats based on entity type
-        if npub_or_entity.startswith("npub"):
-            # npub decodes to just a hex string
-            return {"pubkey": output}
-        elif npub_or_entity.startswith("note"):
-            # note decodes to just a hex string
-            return {"event_id": output}
-        else:
-            # Try to parse as JSON first, fall back to raw output
-            try:
-                return json.loads(output)
-            except json.JSONDecodeError:
-                return output
+        # Try to parse as JSON first, fall back to raw output
+        try:
+            return _json.loads(output)
+        except _json.JSONDecodeError:
+            return output
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr if e.stderr else str(e)
         raise ValueError(f"Failed to decode {npub_or_entity}: {error_msg}")
 
 
+@functools.lru_cache(maxsize=8192)
 def nak_encode(hex_string: str, prefix: str = "npub") -> str:
     """
     Encode a hex string to a NIP-19 entity using NAK.
@@ -62,6 +121,15 @@ def nak_encode(hex_string: str, prefix: str = "npub") -> str:
     Raises:
         subprocess.CalledProcessError: If NAK encode fails
     """
+    # Plain 32-byte entities encode in-process; anything else (TLV
+    # prefixes would need more context than a bare hex string) goes
+    # through nak as before
+    if prefix in ("npub", "nsec", "note"):
+        try:
+            return nip19.bech32_encode(prefix, bytes.fromhex(hex_string))
+        except ValueError as e:
+            raise ValueError(f"Failed to encode {hex_string}: {e}")
+
     try:
         result = subprocess.run(
             ["nak", "encode", "--prefix", prefix, hex_string],
@@ -95,31 +163,39 @@ def nak_fetch(
     """
     cmd = ["nak", "fetch"]
 
-    if relays:
-        for relay in relays:
-            cmd.extend(["--relay", relay])
-
     cmd.extend(["--timeout", str(timeout)])
 
     if raw:
         cmd.append("--raw")
 
+    # The entity is positional and must come after every flag: nak stops
+    # flag parsing at the first positional, so a --relay placed behind
+    # the entity would be silently ignored
+
+    # With several relays, query them concurrently instead of letting one
+    # nak invocation walk them serially
+    if relays and len(relays) > 1 and not raw:
+        return _fanout_relays(cmd[1:], relays, [entity])
+
+    if relays:
+        for relay in relays:
+            cmd.extend(["--relay", relay])
+
     cmd.append(entity)
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        output = get_daemon().call(cmd[1:])
+    except ValueError as e:
+        raise ValueError(f"Failed to fetch {entity}: {e}")
 
-        # Try to parse as JSON if not raw, otherwise return stdout
-        if raw:
-            return result.stdout.strip()
+    # Try to parse as JSON if not raw, otherwise return stdout
+    if raw:
+        return output
 
-        try:
-            return json.loads(result.stdout)
-        except json.JSONDecodeError:
-            return {"raw_output": result.stdout.strip()}
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr if e.stderr else str(e)
-        raise ValueError(f"Failed to fetch {entity}: {error_msg}")
+    try:
+        return _json.loads(output)
+    except _json.JSONDecodeError:
+        return {"raw_output": output}
 
 
 def nak_event(
@@ -148,15 +224,14 @@ def nak_event(
                 cmd.extend(["--tags", f"{tag[0]}:{tag[1]}"])
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        output = get_daemon().call(cmd[1:])
+    except ValueError as e:
+        raise ValueError(f"Failed to create event: {e}")
 
-        try:
-            return json.loads(result.stdout)
-        except json.JSONDecodeError:
-            return {"raw_output": result.stdout.strip()}
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr if e.stderr else str(e)
-        raise ValueError(f"Failed to create event: {error_msg}")
+    try:
+        return _json.loads(output)
+    except _json.JSONDecodeError:
+        return {"raw_output": output}
 
 
 def is_nak_installed() -> bool:
@@ -190,23 +265,30 @@ def nak_req(filters: Dict, relays: List[str] = None, timeout: int = 10) -> List[
     """
     cmd = ["nak", "req"]
 
-    # Add filter parameters
+    # Add filter parameters. Repeated flags are flattened straight into
+    # cmd via chain.from_iterable rather than allocating a throwaway
+    # two-element list per value
     if "authors" in filters:
-        for author in filters["authors"]:
-            cmd.extend(["--authors", author])
+        cmd.extend(
+            chain.from_iterable(("--authors", author) for author in filters["authors"])
+        )
 
     if "kinds" in filters:
-        for kind in filters["kinds"]:
-            cmd.extend(["--kinds", str(kind)])
+        cmd.extend(
+            chain.from_iterable(("--kinds", str(kind)) for kind in filters["kinds"])
+        )
 
     if "ids" in filters:
-        for id in filters["ids"]:
-            cmd.extend(["--ids", id])
+        cmd.extend(chain.from_iterable(("--ids", id) for id in filters["ids"]))
 
     if "tags" in filters:
-        for tag_name, tag_values in filters["tags"].items():
-            for value in tag_values:
-                cmd.extend(["--tags", f"{tag_name}:{value}"])
+        cmd.extend(
+            chain.from_iterable(
+                ("--tags", f"{tag_name}:{value}")
+                for tag_name, tag_values in filters["tags"].items()
+                for value in tag_values
+            )
+        )
 
     if "since" in filters:
         cmd.extend(["--since", str(filters["since"])])
@@ -217,24 +299,26 @@ def nak_req(filters: Dict, relays: List[str] = None, timeout: int = 10) -> List[
     if "limit" in filters:
         cmd.extend(["--limit", str(filters["limit"])])
 
-    # Add relays
-    if relays:
-        for relay in relays:
-            cmd.extend(["--relay", relay])
-
     cmd.extend(["--timeout", str(timeout)])
 
+    # Fan the REQ out across relays in parallel; results are merged and
+    # deduped by event id
+    if relays and len(relays) > 1:
+        return _fanout_relays(cmd[1:], relays)
+
+    if relays:
+        cmd.extend(chain.from_iterable(("--relay", relay) for relay in relays))
+
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        output = get_daemon().call(cmd[1:])
+    except ValueError as e:
+        raise ValueError(f"Failed to execute req: {e}")
 
-        # Try to parse as JSON
-        try:
-            return json.loads(result.stdout)
-        except json.JSONDecodeError:
-            return [{"raw_output": result.stdout.strip()}]
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr if e.stderr else str(e)
-        raise ValueError(f"Failed to execute req: {error_msg}")
+    # Try to parse as JSON
+    try:
+        return _json.loads(output)
+    except _json.JSONDecodeError:
+        return [{"raw_output": output}]
 
 
 def run_nak_command(command_args: List[str], input_data: str = None) -> str:
@@ -251,18 +335,6 @@ def run_nak_command(command_args: List[str], input_data: str = None) -> str:
     Raises:
         subprocess.CalledProcessError: If NAK command fails
     """
-    cmd = ["nak"] + command_args
-
-    try:
-        if input_data:
-            result = subprocess.run(
-                cmd, input=input_data, capture_output=True, text=True, check=True
-            )
-        else:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr if e.stderr else str(e)
-        cmd_str = " ".join(shlex.quote(arg) for arg in cmd)
-        raise ValueError(f"Failed to run command '{cmd_str}': {error_msg}")
+    # Routed through the shared daemon wrapper so a persistent nak child
+    # is reused when the installed build supports one
+    return get_daemon().call(command_args, input_data)
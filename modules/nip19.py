@@ -0,0 +1,163 @@
+"""In-process NIP-19 bech32 encoding/decoding.
+
+Forking nak just to bech32-encode a hex id plus TLV relay hints costs a
+full process spawn per event. The codec below (reference BIP-173 bech32
+plus the NIP-19 TLV layout) does the same work in-process; callers keep
+the nak path as a fallback.
+"""
+
+from typing import Dict, List, Optional
+
+_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+# NIP-19 TLV types
+_TLV_SPECIAL = 0
+_TLV_RELAY = 1
+_TLV_AUTHOR = 2
+_TLV_KIND = 3
+
+
+def _polymod(values: List[int]) -> int:
+    generator = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            chk ^= generator[i] if ((top >> i) & 1) else 0
+    return chk
+
+
+def _hrp_expand(hrp: str) -> List[int]:
+    return [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+
+
+def _create_checksum(hrp: str, data: List[int]) -> List[int]:
+    values = _hrp_expand(hrp) + data
+    polymod = _polymod(values + [0, 0, 0, 0, 0, 0]) ^ 1
+    return [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+
+
+def _verify_checksum(hrp: str, data: List[int]) -> bool:
+    return _polymod(_hrp_expand(hrp) + data) == 1
+
+
+def _convertbits(data, frombits: int, tobits: int, pad: bool = True) -> List[int]:
+    """General power-of-2 base conversion from the BIP-173 reference"""
+    acc = 0
+    bits = 0
+    ret = []
+    maxv = (1 << tobits) - 1
+    max_acc = (1 << (frombits + tobits - 1)) - 1
+    for value in data:
+        if value < 0 or (value >> frombits):
+            raise ValueError("Invalid value for conversion")
+        acc = ((acc << frombits) | value) & max_acc
+        bits += frombits
+        while bits >= tobits:
+            bits -= tobits
+            ret.append((acc >> bits) & maxv)
+    if pad:
+        if bits:
+            ret.append((acc << (tobits - bits)) & maxv)
+    elif bits >= frombits or ((acc << (tobits - bits)) & maxv):
+        raise ValueError("Invalid padding in conversion")
+    return ret
+
+
+def bech32_encode(hrp: str, data: bytes) -> str:
+    """Encode bytes under the given human-readable prefix"""
+    d = _convertbits(data, 8, 5)
+    return hrp + "1" + "".join(_CHARSET[x] for x in d + _create_checksum(hrp, d))
+
+
+def bech32_decode(bech: str) -> (str, bytes):
+    """Decode a bech32 string into (hrp, data bytes).
+
+    NIP-19 strings exceed BIP-173's 90-char limit, so no length cap is
+    applied here.
+    """
+    bech = bech.lower()
+    pos = bech.rfind("1")
+    if pos < 1 or pos + 7 > len(bech):
+        raise ValueError(f"Invalid bech32 string: {bech}")
+    hrp = bech[:pos]
+    data = []
+    for c in bech[pos + 1 :]:
+        idx = _CHARSET.find(c)
+        if idx == -1:
+            raise ValueError(f"Invalid bech32 character: {c}")
+        data.append(idx)
+    if not _verify_checksum(hrp, data):
+        raise ValueError(f"Invalid bech32 checksum: {bech}")
+    return hrp, bytes(_convertbits(data[:-6], 5, 8, pad=False))
+
+
+def _tlv(tlv_type: int, value: bytes) -> bytes:
+    return bytes((tlv_type, len(value))) + value
+
+
+def _parse_tlv(data: bytes) -> List[tuple]:
+    entries = []
+    i = 0
+    while i + 2 <= len(data):
+        tlv_type = data[i]
+        length = data[i + 1]
+        entries.append((tlv_type, data[i + 2 : i + 2 + length]))
+        i += 2 + length
+    return entries
+
+
+def encode_nevent(
+    id_hex: str, relays: Optional[List[str]] = None, author: Optional[str] = None
+) -> str:
+    """Encode an event id with relay/author hints as an nevent"""
+    payload = _tlv(_TLV_SPECIAL, bytes.fromhex(id_hex))
+    for relay in relays or []:
+        payload += _tlv(_TLV_RELAY, relay.encode("utf-8"))
+    if author:
+        payload += _tlv(_TLV_AUTHOR, bytes.fromhex(author))
+    return bech32_encode("nevent", payload)
+
+
+def encode_naddr(
+    kind: int, pubkey_hex: str, identifier: str, relays: Optional[List[str]] = None
+) -> str:
+    """Encode a replaceable-event coordinate as an naddr"""
+    payload = _tlv(_TLV_SPECIAL, identifier.encode("utf-8"))
+    for relay in relays or []:
+        payload += _tlv(_TLV_RELAY, relay.encode("utf-8"))
+    payload += _tlv(_TLV_AUTHOR, bytes.fromhex(pubkey_hex))
+    payload += _tlv(_TLV_KIND, kind.to_bytes(4, "big"))
+    return bech32_encode("naddr", payload)
+
+
+def decode(code: str) -> Dict:
+    """Decode a NIP-19 code into the same shape nak decode prints.
+
+    Supports note/npub/nsec (plain 32-byte payloads) and nevent/naddr/
+    nprofile (TLV payloads).
+    """
+    hrp, data = bech32_decode(code)
+
+    if hrp in ("note", "npub", "nsec"):
+        key = "id" if hrp == "note" else "pubkey" if hrp == "npub" else "private_key"
+        return {key: data.hex()}
+
+    result: Dict = {"relays": []}
+    for tlv_type, value in _parse_tlv(data):
+        if tlv_type == _TLV_SPECIAL:
+            if hrp == "naddr":
+                result["identifier"] = value.decode("utf-8")
+            elif hrp == "nprofile":
+                result["pubkey"] = value.hex()
+            else:
+                result["id"] = value.hex()
+        elif tlv_type == _TLV_RELAY:
+            result["relays"].append(value.decode("utf-8"))
+        elif tlv_type == _TLV_AUTHOR:
+            key = "pubkey" if hrp == "naddr" else "author"
+            result[key] = value.hex()
+        elif tlv_type == _TLV_KIND:
+            result["kind"] = int.from_bytes(value, "big")
+    return result
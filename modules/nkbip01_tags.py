@@ -4,16 +4,41 @@ Implements the full tag specification for curated publications
 """
 
 from typing import List, Dict, Optional, Literal
-import re
+import functools
+import string
+
+# DFA-based engine when available, same pattern syntax for our regexes
+try:
+    import re2 as re
+except ImportError:
+    import re
+
+# Compiled once at import instead of per call
+_CLEAN_NONWORD = re.compile(r"[^\w\s-]")
+_CLEAN_SEPS = re.compile(r"[-\s]+")
+
+# For ASCII input (the common case for titles and d-tags) one translate
+# call both lowercases and drops punctuation, replacing the
+# lower()+regex pair. Whitespace survives so the separator collapse
+# below still turns it into hyphens, matching the regex path exactly.
+_CLEAN_TABLE = {
+    i: None
+    for i in range(128)
+    if not (chr(i).isalnum() or chr(i).isspace() or chr(i) in "-_")
+}
+_CLEAN_TABLE.update({ord(c): ord(c.lower()) for c in string.ascii_uppercase})
 
 
+@functools.lru_cache(maxsize=2048)
 def clean_tag(text: str) -> str:
     """Clean text for use in tags"""
-    # Remove special characters and convert to lowercase
-    cleaned = re.sub(r"[^\w\s-]", "", text.lower())
-    # Replace spaces with hyphens and remove multiple hyphens
-    cleaned = re.sub(r"[-\s]+", "-", cleaned)
-    return cleaned.strip("-")
+    # Remove special characters, lowercase, collapse separators to hyphens.
+    # Titles and topic tags repeat across a publication, so memoize.
+    if text.isascii():
+        cleaned = text.translate(_CLEAN_TABLE)
+    else:
+        cleaned = _CLEAN_NONWORD.sub("", text.lower())
+    return _CLEAN_SEPS.sub("-", cleaned).strip("-")
 
 
 def create_reference_tag(
@@ -24,6 +49,14 @@ def create_reference_tag(
     return ["a", ref, relay_hint, event_id]
 
 
+def _index_tags(tags: List[List[str]]) -> Dict[str, List[int]]:
+    """Index tag positions by name in one pass: name -> list of indices"""
+    idx = {}
+    for i, tag in enumerate(tags):
+        idx.setdefault(tag[0], []).append(i)
+    return idx
+
+
 # Publication types as defined in NKBIP-01
 PublicationType = Literal[
     "book", "illustrated", "magazine", "documentation", "academic", "blog"
@@ -63,6 +96,7 @@ class NKBIP01Tags:
         version: str = "1",
         external: bool = False,
         metadata: Optional[Dict] = None,
+        author_pubkey: Optional[str] = None,
     ) -> List[List[str]]:
         """
         Create tags for a 30040 publication index event
@@ -73,11 +107,19 @@ class NKBIP01Tags:
         - auto-update: update behavior
         - m: MIME type
         - M: Nostr categorization
+
+        The author's p tag, when given, is placed directly after
+        auto-update so callers don't have to scan for the slot and
+        insert it afterwards.
         """
         tags = [
             ["d", d_tag],
             ["title", title],
             ["auto-update", auto_update],
+        ]
+        if author_pubkey:
+            tags.append(["p", author_pubkey])
+        tags += [
             ["type", publication_type],
             ["m", MIME_TYPES["index"]],
             ["M", NOSTR_CATEGORIES["external" if external else "index"]],
@@ -211,37 +253,38 @@ class NKBIP01Tags:
         Returns (is_valid, list_of_errors)
         """
         errors = []
-        tag_dict = {tag[0]: tag[1:] for tag in tags}
+        # One pass over the tags; every check below is a dict probe
+        idx = _index_tags(tags)
 
         # Check required tags
         required = ["d", "title", "auto-update", "m", "M"]
         for req in required:
-            if req not in tag_dict:
+            if req not in idx:
                 errors.append(f"Missing required tag: {req}")
 
         # Validate auto-update value
-        if "auto-update" in tag_dict:
-            if tag_dict["auto-update"][0] not in ["yes", "ask", "no"]:
+        if "auto-update" in idx:
+            if tags[idx["auto-update"][0]][1] not in ["yes", "ask", "no"]:
                 errors.append("auto-update must be 'yes', 'ask', or 'no'")
 
         # Validate MIME type
-        if "m" in tag_dict:
-            if tag_dict["m"][0] != "application/json":
+        if "m" in idx:
+            if tags[idx["m"][0]][1] != "application/json":
                 errors.append("Index events must have MIME type 'application/json'")
 
         # Check for 'a' tags (references)
-        has_references = any(tag[0] == "a" for tag in tags)
-        if not has_references:
+        if "a" not in idx:
             errors.append("Index must include at least one 'a' tag reference")
 
-        # Check p/E tag ordering for derivative works
-        p_index = None
-        for i, tag in enumerate(tags):
-            if tag[0] == "p":
-                p_index = i
-            elif tag[0] == "E" and p_index is not None:
-                if i != p_index + 1:
-                    errors.append("E tag must immediately follow p tag")
+        # Check p/E tag ordering for derivative works: one forward scan
+        # flagging any E tag not immediately preceded by its p. A p tag
+        # with no E at all is a plain author reference and stays valid.
+        prev_t0 = None
+        for tag in tags:
+            t0 = tag[0]
+            if t0 == "E" and prev_t0 != "p":
+                errors.append("E tag must immediately follow p tag")
+            prev_t0 = t0
 
         return len(errors) == 0, errors
 
@@ -252,12 +295,12 @@ class NKBIP01Tags:
         Returns (is_valid, list_of_errors)
         """
         errors = []
-        tag_dict = {tag[0]: tag[1:] for tag in tags}
+        idx = _index_tags(tags)
 
         # Check required tags
         required = ["d", "title"]
         for req in required:
-            if req not in tag_dict:
+            if req not in idx:
                 errors.append(f"Missing required tag: {req}")
 
         return len(errors) == 0, errors
@@ -267,41 +310,40 @@ def upgrade_legacy_tags(tags: List[List[str]], event_kind: int) -> List[List[str
     """
     Upgrade legacy tag structure to NKBIP-01 compliance
     """
-    tag_dict = {tag[0]: tag[1:] for tag in tags}
+    # One index built up front replaces the dict comp plus the linear
+    # rescan for the language tag
+    idx = _index_tags(tags)
 
     # Add missing MIME type
-    if "m" not in tag_dict:
+    if "m" not in idx:
         if event_kind == 30040:
             tags.append(["m", MIME_TYPES["index"]])
         else:
             tags.append(["m", MIME_TYPES["asciidoc"]])
 
     # Add missing M tag
-    if "M" not in tag_dict:
+    if "M" not in idx:
         if event_kind == 30040:
-            is_external = "external" in tag_dict and tag_dict["external"][0] == "true"
+            is_external = "external" in idx and tags[idx["external"][0]][1] == "true"
             tags.append(["M", NOSTR_CATEGORIES["external" if is_external else "index"]])
         else:
             tags.append(["M", NOSTR_CATEGORIES["content"]])
 
     # Fix language tag format
-    if "l" in tag_dict:
-        lang_value = tag_dict["l"][0]
+    if "l" in idx:
+        l_index = idx["l"][0]
+        lang_value = tags[l_index][1]
         if "ISO-639-1" not in lang_value:
-            # Find and update the language tag
-            for i, tag in enumerate(tags):
-                if tag[0] == "l":
-                    tags[i] = ["l", f"{lang_value}, ISO-639-1"]
-                    break
+            tags[l_index] = ["l", f"{lang_value}, ISO-639-1"]
     else:
         tags.append(["l", "en, ISO-639-1"])
 
     # Add reading direction if missing (only for index)
-    if event_kind == 30040 and "reading-direction" not in tag_dict:
+    if event_kind == 30040 and "reading-direction" not in idx:
         tags.append(["reading-direction", "left-to-right, top-to-bottom"])
 
     # Add version if missing
-    if "version" not in tag_dict:
+    if "version" not in idx:
         tags.append(["version", "1"])
 
     return tags
@@ -1,8 +1,13 @@
+import functools
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Literal
-from habanero import Crossref
 import json
-from pprint import pprint
+import requests
+
+from modules import _doi_cache
 
 # Import NKBIP-01 utilities
 from modules.nkbip01_tags import (
@@ -15,13 +20,42 @@ from modules.nkbip01_tags import (
 )
 
 
+# Compiled once at import; clean_tag runs once per section during large
+# document ingestion, so skip the per-call re-cache lookups
+_CLEAN_NON_WORD = re.compile(r"[^\w\s-]")
+_CLEAN_DASHES = re.compile(r"[-\s]+")
+_HTML_TAG = re.compile(r"<[^<]+?>")
+_SLUG_NONALNUM = re.compile(r"[^a-z0-9]")
+_SLUG_DASHES = re.compile(r"-+")
+
+# ASCII fast path: one translate call lowercases and drops punctuation
+# without entering the regex engine. Whitespace is kept so the dash
+# collapse below behaves exactly like the regex path.
+_CLEAN_TABLE = {
+    i: None
+    for i in range(128)
+    if not (chr(i).isalnum() or chr(i).isspace() or chr(i) in "-_")
+}
+_CLEAN_TABLE.update({i: i + 32 for i in range(ord("A"), ord("Z") + 1)})
+
+
+@functools.lru_cache(maxsize=4096)
 def clean_tag(text: str) -> str:
     """Clean text for use in tags"""
-    # Remove special characters and convert to lowercase
-    cleaned = re.sub(r"[^\w\s-]", "", text.lower())
-    # Replace spaces with hyphens and remove multiple hyphens
-    cleaned = re.sub(r"[-\s]+", "-", cleaned)
-    return cleaned.strip("-")
+    # Pure and called with the same doc/section titles over and over
+    # (section tags, index tags, every reference), so memoize
+    if text.isascii():
+        cleaned = text.translate(_CLEAN_TABLE)
+    else:
+        cleaned = _CLEAN_NON_WORD.sub("", text.lower())
+    return _CLEAN_DASHES.sub("-", cleaned).strip("-")
+
+
+@functools.lru_cache(maxsize=4096)
+def slugify(text: str) -> str:
+    """Lowercase text into a hyphenated slug (a-z0-9 and hyphens only)"""
+    slug = _SLUG_NONALNUM.sub("-", text.lower())
+    return _SLUG_DASHES.sub("-", slug).strip("-")
 
 
 def extract_wiki_links(content: str) -> List[str]:
@@ -47,6 +81,17 @@ def extract_wiki_links(content: str) -> List[str]:
     return wiki_terms
 
 
+# Tag-type strings recur across thousands of tags; interning keeps one
+# shared object per name, so serialization compares pointers not chars
+T_A = sys.intern("a")
+T_D = sys.intern("d")
+T_TITLE = sys.intern("title")
+T_AUTHOR = sys.intern("author")
+T_URL = sys.intern("url")
+T_AUTO_UPDATE = sys.intern("auto-update")
+T_TYPE = sys.intern("type")
+
+
 def create_standard_tag(tag_type: str, value: str) -> List[str]:
     """Create a standard tag with type and value"""
     return [tag_type, value]
@@ -60,7 +105,7 @@ def create_reference_tag(
     """
     # Create the reference string without the dtag prefix
     ref = f"{kind}:{pubkey}:{d_tag}"
-    return ["a", ref, relay_hint, event_id]
+    return [T_A, ref, relay_hint, event_id]
 
 
 def create_section_tags(
@@ -111,53 +156,74 @@ def add_reference_to_index(
     return index_tags
 
 
+# OpenGraph field -> NKBIP-01 metadata key, walked in order so later
+# entries (book:release_date) override earlier ones (article time)
+_OG_META_MAP = (
+    (("image",), "image"),
+    (("meta", "description"), "summary"),
+    (("meta", "article:published_time"), "published_on"),
+    (("url",), "source"),
+    (("meta", "book:isbn"), "isbn"),
+    (("meta", "book:release_date"), "published_on"),
+)
+
+
+# The OpenGraph book: keys we ever read; presence of any marks a book
+_BOOK_KEYS = ("book:author", "book:isbn", "book:release_date")
+
+
+def _dig(d: dict, path: tuple):
+    """Follow a key path into nested dicts; None when any hop is missing"""
+    for key in path:
+        if not isinstance(d, dict):
+            return None
+        d = d.get(key)
+        if d is None:
+            return None
+    return d
+
+
 def create_external_tags(open_graph: dict, debug=False) -> List[List[str]]:
     """Create an external event using the OpenGraph data and sections"""
-    # Extract necessary data from OpenGraph
+    # Extract necessary data from OpenGraph, each key looked up once
+    # into a local instead of re-hashing per use
     meta = open_graph.get("meta", {})
-    
-    # Build metadata dict for NKBIP-01
+    url = open_graph.get("url")
+    title = open_graph.get("title", "")
+    art_tags = meta.get("article:tag")
+    art_author = meta.get("article:author")
+    book_author = meta.get("book:author")
+
+    # Build metadata dict for NKBIP-01: one loop over the declarative
+    # field map instead of a hand-written branch per field
     metadata = {}
-    
-    if open_graph.get("image"):
-        metadata["image"] = open_graph["image"]
-    if meta.get("description"):
-        metadata["summary"] = meta["description"]
-    if meta.get("article:published_time"):
-        metadata["published_on"] = meta["article:published_time"]
-    if open_graph.get("url"):
-        metadata["source"] = open_graph["url"]
-    
+    for path, target in _OG_META_MAP:
+        value = _dig(open_graph, path)
+        if value:
+            metadata[target] = value
+
     # Collect tags
     tags_list = []
-    if meta.get("article:tag"):
-        tags_list.extend(meta["article:tag"])
+    if art_tags:
+        tags_list.extend(art_tags)
     metadata["tags"] = tags_list
-    
+
     # Collect authors
     authors = []
-    if meta.get("article:author"):
-        authors.append(meta["article:author"])
-    if meta.get("book:author"):
-        authors.append(meta["book:author"])
-    
-    # ISBN
-    if meta.get("book:isbn"):
-        metadata["isbn"] = meta["book:isbn"]
-    
-    # Publication date
-    if meta.get("book:release_date"):
-        metadata["published_on"] = meta["book:release_date"]
-    
-    # Determine publication type
-    pub_type = "book" if "book:" in str(meta) else "article"
+    if art_author:
+        authors.append(art_author)
+    if book_author:
+        authors.append(book_author)
+
+    # Determine publication type: three dict probes instead of
+    # stringifying the whole meta payload to scan for "book:"
+    pub_type = "book" if any(k in meta for k in _BOOK_KEYS) else "article"
     if open_graph.get("type") == "academic":
         pub_type = "academic"
-    
+
     # Create NKBIP-01 compliant tags
-    title = open_graph.get("title", "")
     d_tag = clean_tag(title)
-    
+
     tags = NKBIP01Tags.create_index_tags(
         title=title,
         d_tag=d_tag,
@@ -166,15 +232,15 @@ def create_external_tags(open_graph: dict, debug=False) -> List[List[str]]:
         external=True,
         metadata=metadata
     )
-    
+
     # Add additional authors
     for author in authors[1:]:
-        tags.append(["author", author])
-    
+        tags.append([T_AUTHOR, author])
+
     # Add URL tag if present
-    if open_graph.get("url"):
-        tags.append(["url", open_graph["url"]])
-    
+    if url:
+        tags.append([T_URL, url])
+
     if debug:
         for tag in tags:
             print(f"Debug: Tag: {tag[0]} - Value: {tag[1] if len(tag) > 1 else ''}")
@@ -182,93 +248,231 @@ def create_external_tags(open_graph: dict, debug=False) -> List[List[str]]:
     return tags
 
 
+def _clean_doi(doi: str) -> str:
+    """Strip the https://doi.org prefix if present"""
+    return doi.replace("https://doi.org", "") if "https://doi.org" in doi else doi
+
+
+def _build_tags_from_crossref(clean_doi: str, metadata: Dict) -> List[List[str]]:
+    """Map one Crossref work record to NKBIP-01 index tags"""
+    # Build metadata dict
+    meta_dict = {
+        "doi": clean_doi,
+        "source": f"https://doi.org/{clean_doi}",
+        "published_by": metadata.get("publisher", "public domain")
+    }
+
+    # Cover image (using a generic pattern for Springer journals)
+    if "ISSN" in metadata and metadata["ISSN"]:
+        meta_dict["image"] = "https://i.nostr.build/kUoQk9R1PsWBN5nb.jpg"
+
+    # Summary (title or abstract)
+    if "title" in metadata and metadata["title"]:
+        summary = metadata["title"][0]
+        if "abstract" in metadata and metadata["abstract"]:
+            # Use abstract instead if available (clean HTML tags)
+            summary = _HTML_TAG.sub("", metadata["abstract"])
+        meta_dict["summary"] = summary
+
+    # Published date
+    if "published" in metadata and "date-parts" in metadata["published"]:
+        date_parts = metadata["published"]["date-parts"][0]
+        if len(date_parts) >= 3:
+            published_date = f"{date_parts[0]}-{date_parts[1]:02d}-{date_parts[2]:02d}"
+            meta_dict["published_on"] = published_date
+
+    # Title and d-tag
+    title = metadata["title"][0] if "title" in metadata and metadata["title"] else ""
+    title_slug = slugify(title)
+
+    # Authors and the first family name in one pass, with a single join
+    # per name instead of a += chain
+    authors = []
+    first_family = ""
+    for i, author in enumerate(metadata.get("author") or ()):
+        given = author.get("given", "")
+        family = author.get("family", "")
+        if i == 0:
+            first_family = family
+        name = f"{given} {family}".strip() if given or family else ""
+        if name:
+            authors.append(name)
+    first_author = slugify(first_family) if first_family else ""
+
+    doc_id = f"{title_slug}-by-{first_author}-v-1" if first_author else f"{title_slug}-v-1"
+
+    # Additional authors for metadata
+    if len(authors) > 1:
+        meta_dict["additional_authors"] = authors[1:]
+
+    # Create NKBIP-01 compliant tags
+    return NKBIP01Tags.create_index_tags(
+        title=title,
+        d_tag=doc_id,
+        author=authors[0] if authors else None,
+        publication_type="academic",
+        external=True,
+        metadata=meta_dict
+    )
+
+
+# Prefixes registered with other agencies (DataCite and friends);
+# Crossref will never resolve these, so skip the round-trip outright
+_NON_CROSSREF_PREFIXES = {
+    "10.5281",  # Zenodo
+    "10.5061",  # Dryad
+    "10.6084",  # figshare
+    "10.7937",  # TCIA
+    "10.48550",  # arXiv
+    "10.17605",  # OSF
+}
+
+_AUTHORITY_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "nkbip_converter", "authority_cache.json"
+)
+_authority_cache = None
+
+
+def _doi_authority(prefix: str) -> Optional[str]:
+    """Registration agency for a DOI prefix, cached across runs.
+
+    Returns None when the agency can't be determined, in which case the
+    caller should let Crossref try anyway.
+    """
+    global _authority_cache
+    if _authority_cache is None:
+        try:
+            with open(_AUTHORITY_CACHE_PATH, "r") as f:
+                _authority_cache = json.load(f)
+        except (OSError, ValueError):
+            _authority_cache = {}
+
+    if prefix in _authority_cache:
+        return _authority_cache[prefix]
+
+    try:
+        response = requests.get(f"https://doi.org/ra/{prefix}", timeout=10)
+        ra = response.json()[0].get("RA", "")
+    except Exception:
+        return None
+
+    _authority_cache[prefix] = ra
+    try:
+        os.makedirs(os.path.dirname(_AUTHORITY_CACHE_PATH), exist_ok=True)
+        tmp = f"{_AUTHORITY_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(_authority_cache, f)
+        os.replace(tmp, _AUTHORITY_CACHE_PATH)
+    except OSError:
+        pass
+    return ra
+
+
+def _is_crossref_doi(clean_doi: str) -> bool:
+    """Cheap authority check before spending a Crossref request"""
+    prefix = clean_doi.lstrip("/").split("/", 1)[0]
+    if prefix in _NON_CROSSREF_PREFIXES:
+        return False
+    ra = _doi_authority(prefix)
+    return ra is None or ra == "Crossref"
+
+
+# Crossref allows many doi: filters per query; 40 keeps the request URI
+# comfortably under length limits
+_DOI_BATCH_SIZE = 40
+
+# One Session for every DOI fetch: keep-alive reuses the TCP/TLS
+# connection across chunks instead of handshaking per request, and the
+# thread-safe urllib3 pool underneath serves the chunk workers too.
+# Setting NKBIP_CROSSREF_MAILTO routes requests through Crossref's
+# polite pool, which is faster and throttled less.
+_SESSION = None
+
+
+def _get_session() -> requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        _SESSION.headers.update(
+            {
+                "User-Agent": "nkbip_converter (+https://github.com/limina1/nkbip_converter)",
+                "Accept": "application/json",
+            }
+        )
+    return _SESSION
+
+
+def fetch_doi_metadata_batch(dois: List[str]) -> Dict[str, List[List[str]]]:
+    """
+    Fetch metadata for many DOIs in one filtered Crossref query per batch
+    and format each according to NKBIP-01 structure.
+
+    One round-trip covers a whole bibliography chunk instead of one HTTP
+    request per DOI. Returns a dict of normalized (lowercased) DOI ->
+    tags; DOIs Crossref didn't return map to [].
+    """
+    cleaned = [_clean_doi(doi) for doi in dois]
+    results = {}
+
+    # Serve repeat DOIs from the on-disk cache; only misses go to the
+    # network
+    pending = []
+    for doi in cleaned:
+        cached = _doi_cache.get(doi.lower())
+        if cached is not None:
+            results[doi.lower()] = _build_tags_from_crossref(doi.lower(), cached)
+        elif not _is_crossref_doi(doi):
+            print(f"Skipping non-Crossref DOI: {doi}")
+        else:
+            pending.append(doi)
+
+    session = _get_session()
+    mailto = os.environ.get("NKBIP_CROSSREF_MAILTO")
+
+    def fetch_chunk(chunk: List[str]) -> List[Dict]:
+        # Straight REST call: no habanero wrapper frames between us and
+        # the session, and the compact works endpoint response
+        params = {"filter": ",".join(f"doi:{doi}" for doi in chunk), "rows": len(chunk)}
+        if mailto:
+            params["mailto"] = mailto
+        try:
+            response = session.get(
+                "https://api.crossref.org/works", params=params, timeout=30
+            )
+            response.raise_for_status()
+            return response.json().get("message", {}).get("items", [])
+        except Exception as e:
+            print(f"Error fetching DOI metadata batch: {e}")
+            return []
+
+    chunks = [
+        pending[i:i + _DOI_BATCH_SIZE]
+        for i in range(0, len(pending), _DOI_BATCH_SIZE)
+    ]
+
+    # Large bibliographies span several filter chunks; overlap those
+    # round-trips with a bounded pool instead of serializing on RTT. The
+    # cap stays well inside Crossref's polite-pool rate ceiling.
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as pool:
+            for items in pool.map(fetch_chunk, chunks):
+                for item in items:
+                    doi_key = item.get("DOI", "").lower()
+                    if doi_key:
+                        _doi_cache.put(doi_key, item)
+                        results[doi_key] = _build_tags_from_crossref(doi_key, item)
+
+    for doi in cleaned:
+        results.setdefault(doi.lower(), [])
+    return results
+
+
 def fetch_doi_metadata(doi):
     """
     Fetch DOI metadata and format it according to NKBIP-01 structure
     """
-    # Clean DOI if it has a prefix
-    clean_doi = doi.replace("https://doi.org", "") if "https://doi.org" in doi else doi
-    
-    # Initialize Crossref client
-    cr = Crossref()
-    
-    try:
-        # Fetch metadata from Crossref
-        result = cr.works(ids=clean_doi)
-        metadata = result["message"]
-        
-        # Build metadata dict
-        meta_dict = {
-            "doi": clean_doi,
-            "source": f"https://doi.org/{clean_doi}",
-            "published_by": metadata.get("publisher", "public domain")
-        }
-        
-        # Cover image (using a generic pattern for Springer journals)
-        if "ISSN" in metadata and metadata["ISSN"]:
-            meta_dict["image"] = "https://i.nostr.build/kUoQk9R1PsWBN5nb.jpg"
-        
-        # Summary (title or abstract)
-        if "title" in metadata and metadata["title"]:
-            summary = metadata["title"][0]
-            if "abstract" in metadata and metadata["abstract"]:
-                # Use abstract instead if available (clean HTML tags)
-                summary = re.sub("<[^<]+?>", "", metadata["abstract"])
-            meta_dict["summary"] = summary
-        
-        # Published date
-        if "published" in metadata and "date-parts" in metadata["published"]:
-            date_parts = metadata["published"]["date-parts"][0]
-            if len(date_parts) >= 3:
-                published_date = f"{date_parts[0]}-{date_parts[1]:02d}-{date_parts[2]:02d}"
-                meta_dict["published_on"] = published_date
-        
-        # Title and d-tag
-        title = metadata["title"][0] if "title" in metadata and metadata["title"] else ""
-        title_slug = re.sub(r"[^a-z0-9]", "-", title.lower())
-        title_slug = re.sub(r"-+", "-", title_slug).strip("-")
-        
-        # First author
-        first_author = ""
-        authors = []
-        if "author" in metadata and metadata["author"]:
-            for author in metadata["author"]:
-                author_name = ""
-                if "given" in author:
-                    author_name += author["given"]
-                if "family" in author:
-                    if author_name:
-                        author_name += " "
-                    author_name += author["family"]
-                
-                if author_name:
-                    authors.append(author_name)
-            
-            if authors:
-                first_author = metadata["author"][0].get("family", "").lower()
-                first_author = re.sub(r"[^a-z0-9]", "-", first_author)
-        
-        doc_id = f"{title_slug}-by-{first_author}-v-1" if first_author else f"{title_slug}-v-1"
-        
-        # Additional authors for metadata
-        if len(authors) > 1:
-            meta_dict["additional_authors"] = authors[1:]
-        
-        # Create NKBIP-01 compliant tags
-        tags = NKBIP01Tags.create_index_tags(
-            title=title,
-            d_tag=doc_id,
-            author=authors[0] if authors else None,
-            publication_type="academic",
-            external=True,
-            metadata=meta_dict
-        )
-        
-        return tags
-        
-    except Exception as e:
-        print(f"Error fetching DOI metadata: {e}")
-        return []
+    clean_doi = _clean_doi(doi)
+    return fetch_doi_metadata_batch([clean_doi]).get(clean_doi.lower(), [])
 
 
 # Backward compatibility functions
@@ -281,7 +485,7 @@ def create_section_tags_legacy(
     else:
         d_tag = clean_tag(section_title)
 
-    return [["d", d_tag], ["title", section_title]]
+    return [[T_D, d_tag], [T_TITLE, section_title]]
 
 
 def create_index_tags_legacy(
@@ -290,14 +494,14 @@ def create_index_tags_legacy(
     """Legacy version without NKBIP-01 compliance"""
     if doc_author:
         return [
-            ["d", clean_tag(doc_title)],
-            ["title", doc_title],
-            ["auto-update", auto_update],
-            ["author", doc_author],
-            ["type", "book"],
+            [T_D, clean_tag(doc_title)],
+            [T_TITLE, doc_title],
+            [T_AUTO_UPDATE, auto_update],
+            [T_AUTHOR, doc_author],
+            [T_TYPE, "book"],
         ]
     return [
-        ["d", clean_tag(doc_title)],
-        ["title", doc_title],
-        ["auto-update", auto_update],
+        [T_D, clean_tag(doc_title)],
+        [T_TITLE, doc_title],
+        [T_AUTO_UPDATE, auto_update],
     ]
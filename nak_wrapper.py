@@ -9,61 +9,77 @@ import sys
 import subprocess
 import getpass
 import argparse
-import tempfile
 import atexit
 from pathlib import Path
 
 
 class NakWrapper:
     def __init__(self):
-        self.temp_key_file = None
-        self.decrypted_key = None
-        
+        self.key_loaded = False
+
     def cleanup(self):
-        """Clean up temporary files"""
-        if self.temp_key_file and os.path.exists(self.temp_key_file):
-            os.remove(self.temp_key_file)
-            
+        """Drop the key from the environment"""
+        if self.key_loaded:
+            os.environ.pop('NOSTR_SECRET_KEY', None)
+            self.key_loaded = False
+
+
     def read_encrypted_key(self, key_path):
         """Read and decrypt an encrypted key file"""
-        with open(key_path, 'r') as f:
-            encrypted_key = f.read().strip()
-        
+        encrypted_key = Path(key_path).read_text().strip()
+
         # Get password
         password = getpass.getpass("Enter password to decrypt key: ")
-        
-        # Use nak to decrypt
+
+        # Use nak to decrypt. The ncryptsec and password ride argv here
+        # because that is the CLI contract nak actually offers (and what
+        # the rest of the repo uses); a stdin pipe would misbind the
+        # positional arguments.
         result = subprocess.run(
             ['nak', 'key', 'decrypt', encrypted_key, password],
             capture_output=True,
-            text=True
+            text=True,
+            close_fds=False
         )
-        
+
         if result.returncode != 0:
             print(f"Error decrypting key: {result.stderr}")
             sys.exit(1)
-            
-        return result.stdout.strip()
+
+        key = result.stdout.strip()
+        if not self._looks_like_key(key):
+            # nak exited 0 but printed something that isn't a key
+            # (diagnostic, version banner); bail before exporting it
+            print("Error: unexpected key format from nak key decrypt")
+            sys.exit(1)
+        return key
+
+    @staticmethod
+    def _looks_like_key(key):
+        """True for an nsec or a 64-char hex private key"""
+        if key.startswith('nsec1'):
+            return True
+        if len(key) != 64:
+            return False
+        try:
+            bytes.fromhex(key)
+            return True
+        except ValueError:
+            return False
     
     def create_temp_env(self, key):
-        """Create temporary environment with decrypted key"""
-        # Create a temporary file for the decrypted key
-        fd, self.temp_key_file = tempfile.mkstemp(prefix='nak_temp_', suffix='.tmp')
-        os.close(fd)
-        
-        # Write the decrypted key
-        with open(self.temp_key_file, 'w') as f:
-            f.write(key)
-        
-        # Set restrictive permissions
-        os.chmod(self.temp_key_file, 0o600)
-        
-        # Set environment variable
+        """Expose the decrypted key to nak through the environment.
+
+        nak reads NOSTR_SECRET_KEY itself, so the key lives in exactly
+        one place — no temp file on disk to write, chmod and scrub.
+        """
         os.environ['NOSTR_SECRET_KEY'] = key
-        
+        self.key_loaded = True
+
         # Register cleanup
         atexit.register(self.cleanup)
-        
+
+
     def run_interactive_shell(self):
         """Run an interactive shell with nak available"""
         print("\n=== NAK Interactive Shell ===")
@@ -83,35 +99,70 @@ class NakWrapper:
     def run_nak_command(self, args):
         """Run a specific nak command"""
         cmd = ['nak'] + args
-        result = subprocess.run(cmd)
+        # close_fds=False lets CPython spawn via posix_spawn instead of
+        # fork+exec, which is noticeably quicker per interactive command
+        result = subprocess.run(cmd, close_fds=False)
         return result.returncode
-        
+
+    def _start_repl(self):
+        """Start a persistent nak child if this build has a command loop.
+
+        Released nak has no repl/shell subcommand yet; probe the help
+        text once so one long-lived child replaces a fork per input line
+        as soon as a build offers one.
+        """
+        try:
+            help_text = subprocess.run(
+                ['nak', '--help'], capture_output=True, text=True, timeout=10
+            ).stdout
+        except Exception:
+            return None
+        for name in ('repl', 'shell'):
+            if f"\n   {name} " in help_text or f"\n  {name} " in help_text:
+                proc = subprocess.Popen(
+                    ['nak', name],
+                    stdin=subprocess.PIPE,
+                    stdout=sys.stdout,
+                    stderr=sys.stderr,
+                    bufsize=1,
+                    text=True,
+                )
+                atexit.register(proc.terminate)
+                return proc
+        return None
+
     def run_command_loop(self):
         """Run commands in a loop"""
         print("\n=== NAK Command Mode ===")
         print("Your key is loaded. Enter nak commands without the 'nak' prefix.")
         print("Type 'exit' or 'quit' to stop.\n")
-        
+
+        repl = self._start_repl()
+
         while True:
             try:
                 # Get command
                 cmd_input = input("nak> ").strip()
-                
+
                 if cmd_input.lower() in ['exit', 'quit']:
                     break
-                    
+
                 if not cmd_input:
                     continue
-                
-                # Parse and run command
-                args = cmd_input.split()
-                self.run_nak_command(args)
-                
+
+                # Pipe into the persistent child when there is one,
+                # otherwise spawn per command
+                if repl is not None and repl.poll() is None:
+                    repl.stdin.write(cmd_input + "\n")
+                    repl.stdin.flush()
+                else:
+                    self.run_nak_command(cmd_input.split())
+
             except KeyboardInterrupt:
                 print("\nUse 'exit' or 'quit' to stop.")
             except EOFError:
                 break
-                
+
         print("\nGoodbye!")
 
 
@@ -148,10 +199,10 @@ def main():
     wrapper = NakWrapper()
     
     try:
-        # Handle key
-        if args.nsec.startswith('/') or os.path.exists(args.nsec):
-            # It's a file path
-            key = wrapper.read_encrypted_key(args.nsec)
+        # Handle key: one stat decides file path vs literal key
+        nsec_path = Path(args.nsec)
+        if nsec_path.is_file():
+            key = wrapper.read_encrypted_key(str(nsec_path))
         else:
             # It's a key string (nsec or hex)
             key = args.nsec
@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 import sys
 import argparse
-import json
 import os
-import re
-from typing import Dict, List, Optional, Tuple
-import metadata_parser
+
+# Prefer the linear-time RE2 engine for the MULTILINE preamble scans.
+# RE2 has no lookarounds, and not every re2 distribution falls back by
+# itself, so the one lookahead pattern below compiles with the stdlib
+# engine explicitly.
+import re as _stdlib_re
+
+try:
+    import re2 as re
+except ImportError:
+    import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from modules.adoc_parser import parse_adoc_file
 from modules.tag_utils import (
     clean_tag,
@@ -20,11 +29,91 @@ from modules.key_utils import read_encrypted_key
 from modules.event_creator import create_event
 from modules.event_verifier import verify_event
 from modules.event_encoder import encode_event_id
-from modules.event_publisher import publish_event
+from modules.event_publisher import publish_events_batch
 from modules.event_utils import print_event_summary, get_title_from_tags
 from modules.nak_utils import nak_decode
 import warnings
-from pprint import pprint
+
+# Compiled once at import: metadata extraction runs these per file, so
+# skip the re-cache lookup and flag reparsing on every call
+_TITLE_RE = re.compile(r"^=\s+(.+?)$", re.MULTILINE)
+_FIRST_SECTION_RE = re.compile(r"^==\s+.+?$", re.MULTILINE)
+_IMAGE_RE = re.compile(r"image::([^\[]+)")
+_IMAGE_LINE_RE = re.compile(r"^image::([^\[\n]+)", re.MULTILINE)
+_ATTR_RE = re.compile(r"^:([^:]+):\s+(.+?)$", re.MULTILINE)
+# Summary lines: anything that is not blank, an attribute or an image
+# macro, with surrounding whitespace trimmed by the capture. The
+# lookaheads rule this pattern out for RE2, so it stays on stdlib re.
+_SUMMARY_LINE_RE = _stdlib_re.compile(
+    r"^[ \t]*(?![:\s])(?!image::)(.+?)[ \t]*$", _stdlib_re.MULTILINE
+)
+_FILENAME_NONWORD_RE = re.compile(r"[^\w\s-]")
+_FILENAME_SEPS_RE = re.compile(r"[-\s]+")
+
+# Map of AsciiDoc attribute aliases to NKBIP-01 tag names
+_ATTRIBUTE_MAPPING = {
+    "published_on": ["published_on", "publication_date", "date", "publishedon"],
+    "published_by": ["published_by", "publisher", "publishedby"],
+    "source": ["source", "url", "original_url"],
+    "doi": ["doi"],
+    "isbn": ["isbn"],
+    "issn": ["issn"],
+    "version": ["version", "edition"],
+    "language": ["language", "lang"],
+    "type": ["type", "publication_type", "pubtype"],
+    "license": ["license"],
+    "subject": ["subject"],
+    "description": ["description", "abstract"],
+    "copyright": ["copyright"],
+    "translator": ["translator"],
+    "editor": ["editor"],
+    "illustrator": ["illustrator"],
+}
+
+# Inverted once here so the attribute scan does a single dict lookup
+# per key instead of walking every alias list
+_ALIAS_TO_STANDARD = {
+    alias: std for std, aliases in _ATTRIBUTE_MAPPING.items() for alias in aliases
+}
+
+# Handled by the author/tag collection above the mapping, not kept verbatim
+_SKIP_UNMAPPED = frozenset({"author", "authors", "tags", "keywords"})
+
+# Metadata results keyed by (path, mtime_ns, size) so repeat calls on an
+# unchanged file within a run skip the read and regex passes
+_META_CACHE = {}
+
+# Tags handled differently when writing an AsciiDoc file
+_SKIP_TAGS = frozenset({"a", "d", "auto-update", "m", "M", "l", "reading-direction"})
+
+# Standard NKBIP-01 metadata fields copied onto index events, plus the
+# alternate spellings some documents use
+_INDEX_FIELDS = (
+    "image",
+    "summary",
+    "published_on",
+    "published_by",
+    "source",
+    "doi",
+    "isbn",
+    "issn",
+    "tags",
+    "additional_authors",
+)
+_INDEX_FIELD_FALLBACKS = {"published_on": "published", "published_by": "publisher"}
+
+# Language names/codes to ISO 639-1; anything else falls back to the
+# first two characters of the value
+_LANG_TABLE = {
+    "english": "en",
+    "en": "en",
+    "spanish": "es",
+    "es": "es",
+    "español": "es",
+    "french": "fr",
+    "fr": "fr",
+    "français": "fr",
+}
 
 
 def extract_metadata(file_path: str) -> Dict[str, str]:
@@ -32,11 +121,43 @@ def extract_metadata(file_path: str) -> Dict[str, str]:
     Extract metadata from the section between title and first section.
     Returns a dictionary with metadata keys and values following NKBIP-01 spec.
     """
+    st = os.stat(file_path)
+    cache_key = (file_path, st.st_mtime_ns, st.st_size)
+    cached = _META_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Only the preamble before the first section heading is parsed, so
+    # read in chunks and stop once that heading appears instead of
+    # decoding a whole book into memory. Each chunk is scanned once,
+    # together with the carried partial line from the previous one; the
+    # chunks are joined a single time after the loop.
+    first_section_pos = None
+    parts = []
+    carry = ""  # last (possibly partial) line of the previous chunk
+    base = 0  # offset of carry within the joined content
     with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+        while True:
+            chunk = f.read(65536)
+            if chunk:
+                parts.append(chunk)
+            window = carry + chunk
+            match = _FIRST_SECTION_RE.search(window)
+            if match:
+                first_section_pos = base + match.start()
+                break
+            if not chunk:
+                break
+            # A heading may straddle the chunk boundary; carry the last
+            # line into the next window so it is rescanned whole
+            cut = window.rfind("\n") + 1
+            base += cut
+            carry = window[cut:]
+
+    content = "".join(parts)
 
     # Extract document title
-    title_match = re.search(r"^=\s+(.+?)$", content, re.MULTILINE)
+    title_match = _TITLE_RE.search(content)
     if not title_match:
         print("Error: No document title found")
         return {}
@@ -45,10 +166,8 @@ def extract_metadata(file_path: str) -> Dict[str, str]:
 
     # Find the position of the title and the first section heading
     title_pos = title_match.start()
-    first_section_match = re.search(r"^==\s+.+?$", content, re.MULTILINE)
-    first_section_pos = (
-        first_section_match.start() if first_section_match else len(content)
-    )
+    if first_section_pos is None:
+        first_section_pos = len(content)
 
     # Extract the metadata section
     metadata_section = content[title_match.end() : first_section_pos].strip()
@@ -57,125 +176,81 @@ def extract_metadata(file_path: str) -> Dict[str, str]:
     metadata = {"title": title}
 
     # Extract image if it exists (usually right after title)
-    image_match = re.search(r"image::([^\[]+)", metadata_section)
+    image_match = _IMAGE_RE.search(metadata_section)
     if image_match:
         metadata["image"] = image_match.group(1).strip()
 
-    # Extract author information - support multiple authors
-    authors = []
-    author_match = re.search(r"^:author:\s+(.+?)$", metadata_section, re.MULTILINE)
-    if author_match:
-        # Check if it's a comma-separated list
-        author_str = author_match.group(1).strip()
-        if "," in author_str:
-            authors = [a.strip() for a in author_str.split(",")]
-        else:
-            authors = [author_str]
-    
-    # Also check for authors (plural)
-    authors_match = re.search(r"^:authors:\s+(.+?)$", metadata_section, re.MULTILINE)
-    if authors_match:
-        author_str = authors_match.group(1).strip()
-        authors.extend([a.strip() for a in author_str.split(",")])
-    
-    if authors:
-        metadata["author"] = authors[0]  # Primary author
-        if len(authors) > 1:
-            metadata["additional_authors"] = authors[1:]
-
     # Extract summary - usually a paragraph before the first section
-    # Look for a paragraph that's not attribute definition
-    summary_lines = []
-    for line in metadata_section.split("\n"):
-        line = line.strip()
-        if line and not line.startswith(":") and not line.startswith("image::"):
-            summary_lines.append(line)
-
+    # Look for paragraph lines that aren't attribute definitions
+    summary_lines = _SUMMARY_LINE_RE.findall(metadata_section)
     if summary_lines:
         metadata["summary"] = " ".join(summary_lines)
 
-    # Extract all AsciiDoc attributes and map to NKBIP-01 tags
-    attribute_mapping = {
-        "published_on": ["published_on", "publication_date", "date", "publishedon"],
-        "published_by": ["published_by", "publisher", "publishedby"],
-        "source": ["source", "url", "original_url"],
-        "doi": ["doi"],
-        "isbn": ["isbn"],
-        "issn": ["issn"],
-        "version": ["version", "edition"],
-        "language": ["language", "lang"],
-        "type": ["type", "publication_type", "pubtype"],
-        "license": ["license"],
-        "subject": ["subject"],
-        "description": ["description", "abstract"],
-        "copyright": ["copyright"],
-        "translator": ["translator"],
-        "editor": ["editor"],
-        "illustrator": ["illustrator"]
-    }
-    
-    # Process all attributes
-    for match in re.finditer(r"^:([^:]+):\s+(.+?)$", metadata_section, re.MULTILINE):
+    # Process all attributes in a single pass: the generic pattern
+    # already matches the author/tags/keywords lines, so the dedicated
+    # per-attribute scans over the same text are folded in here
+    authors = []
+    tags = []
+    for match in _ATTR_RE.finditer(metadata_section):
         key = match.group(1).strip().lower()
         value = match.group(2).strip()
-        
-        # Map to standard tag names
-        mapped = False
-        for standard_key, aliases in attribute_mapping.items():
-            if key in aliases:
-                metadata[standard_key] = value
-                mapped = True
-                break
-        
-        # If not mapped, still include it
-        if not mapped and key not in ["author", "authors", "tags", "keywords"]:
+
+        # Tags can be specified in different ways
+        if key in ("tags", "keywords", "categories"):
+            tags.extend(tag.strip() for tag in value.split(","))
+
+        # Author information - support multiple authors
+        if key == "author":
+            if "," in value:
+                authors.extend(a.strip() for a in value.split(","))
+            else:
+                authors.append(value)
+        elif key == "authors":
+            authors.extend(a.strip() for a in value.split(","))
+
+        # Map to standard tag names; if not mapped, still include it
+        standard_key = _ALIAS_TO_STANDARD.get(key)
+        if standard_key:
+            metadata[standard_key] = value
+        elif key not in _SKIP_UNMAPPED:
             metadata[key] = value
 
-    # Extract tags (could be specified in different ways)
-    tags = []
-    tags_match = re.search(r"^:tags:\s+(.+?)$", metadata_section, re.MULTILINE)
-    if tags_match:
-        tags = [tag.strip() for tag in tags_match.group(1).split(",")]
-
-    # Some documents use keywords instead of tags
-    keywords_match = re.search(r"^:keywords:\s+(.+?)$", metadata_section, re.MULTILINE)
-    if keywords_match:
-        tags.extend([tag.strip() for tag in keywords_match.group(1).split(",")])
-    
-    # Some use categories
-    categories_match = re.search(r"^:categories:\s+(.+?)$", metadata_section, re.MULTILINE)
-    if categories_match:
-        tags.extend([tag.strip() for tag in categories_match.group(1).split(",")])
+    if authors:
+        metadata["author"] = authors[0]  # Primary author
+        if len(authors) > 1:
+            metadata["additional_authors"] = authors[1:]
 
     if tags:
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_tags = []
+        # Remove duplicates while preserving order; the insertion-ordered
+        # dict replaces the seen-set plus list bookkeeping, and the first
+        # occurrence keeps its casing
+        unique_tags = {}
         for tag in tags:
-            if tag.lower() not in seen:
-                seen.add(tag.lower())
-                unique_tags.append(tag)
-        metadata["tags"] = unique_tags
+            unique_tags.setdefault(tag.lower(), tag)
+        metadata["tags"] = list(unique_tags.values())
 
+    _META_CACHE[cache_key] = metadata
     return metadata
 
 
 def extract_title_image(file_path: str) -> str:
     """Extract the title image from an AsciiDoc file."""
-    metadata = extract_metadata(file_path)
-    return metadata.get("image", "")
+    # The title image sits in the preamble, so a bounded read of the
+    # head plus one search beats the full metadata extraction
+    with open(file_path, "r", encoding="utf-8") as f:
+        head = f.read(8192)
+
+    first_section_match = _FIRST_SECTION_RE.search(head)
+    if first_section_match:
+        head = head[: first_section_match.start()]
+
+    image_match = _IMAGE_RE.search(head)
+    return image_match.group(1).strip() if image_match else ""
 
 
 def extract_images(content: str) -> List[str]:
     """Extract all images from the content."""
-    images = []
-    for line in content.split("\n"):
-        if line.startswith("image::"):
-            image = line.split("::")[1].strip()
-            image = image.split("[")[0].strip()
-            images.append(image)
-
-    return images
+    return [m.group(1).strip() for m in _IMAGE_LINE_RE.finditer(content)]
 
 
 def create_asciidoc_file(
@@ -183,81 +258,89 @@ def create_asciidoc_file(
 ) -> str:
     """Create an AsciiDoc file with the given title, tags, and sections."""
     # Clean filename - remove special characters
-    filename = re.sub(r'[^\w\s-]', '', title)
-    filename = re.sub(r'[-\s]+', '-', filename)
+    filename = _FILENAME_NONWORD_RE.sub('', title)
+    filename = _FILENAME_SEPS_RE.sub('-', filename)
     filename = filename.strip('-')[:100]  # Limit length
     
+    # Assemble the document in memory and write it in one call
+    parts = [f"= {title}\n"]
+
+    # Write metadata as AsciiDoc attributes
+    # Skip certain tags that are handled differently
+    for tag in tags:
+        if len(tag) >= 2 and tag[0] not in _SKIP_TAGS:
+            # Convert tag name to AsciiDoc attribute format
+            attr_name = tag[0].replace("-", "_")
+
+            # Handle special cases
+            if tag[0] == "i":
+                # Extract identifier type and value
+                if ":" in tag[1]:
+                    id_type, id_value = tag[1].split(":", 1)
+                    parts.append(f":{id_type}: {id_value}\n")
+            elif tag[0] == "t":
+                # Collect all t tags into a single tags attribute
+                continue  # Handle after loop
+            else:
+                parts.append(f":{attr_name}: {tag[1]}\n")
+
+    # Collect all topic tags
+    topic_tags = [tag[1] for tag in tags if tag[0] == "t"]
+    if topic_tags:
+        parts.append(f":tags: {', '.join(topic_tags)}\n")
+
+    parts.append(":external: True\n")
+    parts.append("\n")
+
+    if len(sections) > 0:
+        for section in sections:
+            parts.append(f"== {section}\n\n")
+    else:
+        parts.append("== Content\n\n")
+        parts.append("This document was extracted from external content.\n")
+
     with open(f"{filename}.adoc", "w", encoding="utf-8") as f:
-        f.write(f"= {title}\n")
-        
-        # Write metadata as AsciiDoc attributes
-        # Skip certain tags that are handled differently
-        skip_tags = ["a", "d", "auto-update", "m", "M", "l", "reading-direction"]
-        
-        for tag in tags:
-            if len(tag) >= 2 and tag[0] not in skip_tags:
-                # Convert tag name to AsciiDoc attribute format
-                attr_name = tag[0].replace("-", "_")
-                
-                # Handle special cases
-                if tag[0] == "i":
-                    # Extract identifier type and value
-                    if ":" in tag[1]:
-                        id_type, id_value = tag[1].split(":", 1)
-                        f.write(f":{id_type}: {id_value}\n")
-                elif tag[0] == "t":
-                    # Collect all t tags into a single tags attribute
-                    continue  # Handle after loop
-                else:
-                    f.write(f":{attr_name}: {tag[1]}\n")
-        
-        # Collect all topic tags
-        topic_tags = [tag[1] for tag in tags if tag[0] == "t"]
-        if topic_tags:
-            f.write(f":tags: {', '.join(topic_tags)}\n")
-        
-        f.write(":external: True\n")
-        f.write("\n")
-        
-        if len(sections) > 0:
-            for section in sections:
-                f.write(f"== {section}\n\n")
-        else:
-            f.write("== Content\n\n")
-            f.write("This document was extracted from external content.\n")
+        f.write("".join(parts))
     
     print(f"Created {filename}.adoc with sections: {', '.join(sections)}")
     return f"{filename}.adoc"
 
 
-def organize_sections(doc_title: str, sections: List[Dict]) -> List[Dict]:
-    """Organize sections into L1 groups with their L2 sections.
+def iter_sections(doc_title: str, sections: List[Dict]) -> Iterator[Dict]:
+    """Yield L1 groups with their L2 sections, one group at a time.
     Uses document title as root section if no L1 sections exist.
+
+    Yielding each group as soon as it is complete lets callers create
+    events while the next group is still being assembled, instead of
+    materializing the whole tree and walking it a second time.
     """
     # If no L1 sections, create virtual root section from document title
     has_l1_sections = any(s["level"] == 1 for s in sections)
     if not has_l1_sections:
-        return [
-            {
-                "title": doc_title,
-                "content": "",  # No content before first L2
-                "is_root": True,
-                "l2_sections": _group_l2_sections(sections),
-            }
-        ]
+        yield {
+            "title": doc_title,
+            "content": "",  # No content before first L2
+            "is_root": True,
+            "l2_sections": _group_l2_sections(sections),
+        }
+        return
 
     # Normal processing for documents with L1 sections
-    organized = []
+    # Subsection content accumulates in a parts list and is joined when
+    # the section is flushed, so deep nesting doesn't repeatedly recopy
+    # the growing string
     current_l1 = None
     current_l2 = None
+    l2_parts = []
     first_l1 = True
 
     for section in sections:
         if section["level"] == 1:
             if current_l1:
                 if current_l2:
+                    current_l2["content"] = "".join(l2_parts)
                     current_l1["l2_sections"].append(current_l2)
-                organized.append(current_l1)
+                yield current_l1
 
             current_l1 = {
                 "title": section["title"],
@@ -270,37 +353,42 @@ def organize_sections(doc_title: str, sections: List[Dict]) -> List[Dict]:
 
         elif section["level"] == 2 and current_l1:
             if current_l2:
+                current_l2["content"] = "".join(l2_parts)
                 current_l1["l2_sections"].append(current_l2)
 
-            current_l2 = {"title": section["title"], "content": section["content"]}
+            current_l2 = {"title": section["title"]}
+            l2_parts = [section["content"]]
 
         elif section["level"] > 2 and current_l2:
             heading = "=" * section["level"] + " " + section["title"]
-            current_l2["content"] += f"\n\n{heading}\n{section['content']}"
+            l2_parts.append(f"\n\n{heading}\n{section['content']}")
 
     if current_l1:
         if current_l2:
+            current_l2["content"] = "".join(l2_parts)
             current_l1["l2_sections"].append(current_l2)
-        organized.append(current_l1)
-
-    return organized
+        yield current_l1
 
 
 def _group_l2_sections(sections: List[Dict]) -> List[Dict]:
     """Group level 2 sections and their subsections"""
     l2_sections = []
     current_section = None
+    content_parts = []
 
     for section in sections:
         if section["level"] == 2:
             if current_section:
+                current_section["content"] = "".join(content_parts)
                 l2_sections.append(current_section)
-            current_section = {"title": section["title"], "content": section["content"]}
+            current_section = {"title": section["title"]}
+            content_parts = [section["content"]]
         elif section["level"] > 2 and current_section:
             heading = "=" * section["level"] + " " + section["title"]
-            current_section["content"] += f"\n\n{heading}\n{section['content']}"
+            content_parts.append(f"\n\n{heading}\n{section['content']}")
 
     if current_section:
+        current_section["content"] = "".join(content_parts)
         l2_sections.append(current_section)
 
     return l2_sections
@@ -314,9 +402,14 @@ def create_content_event(
     author: Optional[str] = None,
     decrypt=True,
     env_pw=None,
-) -> Dict:
-    """Create a 30041 event for a section"""
+) -> Tuple[Dict, str]:
+    """Create a 30041 event for a section.
+
+    Returns the event together with its d tag, so callers don't have to
+    rescan the tag list for it.
+    """
     tags = create_section_tags(parent_title, title, namespace=True)
+    d_tag = tags[0][1]  # create_section_tags puts the d tag first
     images = extract_images(content)
 
     if images:
@@ -335,7 +428,7 @@ def create_content_event(
     event = create_event(30041, content, tags, key, decrypt=decrypt, env_pw=env_pw)
     if verify_event(event):
         print(f"Event verified: {event['id']}")
-        return event
+        return event, d_tag
     else:
         print("Event verification failed!")
         sys.exit(1)
@@ -351,43 +444,26 @@ def create_index_event(
     author_pubkey: Optional[str] = None,
     decrypt=True,
     env_pw=None,
-) -> Dict:
-    """Create a 30040 event linking to section events with metadata"""
-    # Build complete metadata dict for NKBIP-01
+) -> Tuple[Dict, str]:
+    """Create a 30040 event linking to section events with metadata.
+
+    Returns the event together with its d tag, so callers don't have to
+    rescan the tag list for it.
+    """
+    # Build complete metadata dict for NKBIP-01 from the field table
     index_metadata = {}
-    
+
     if metadata:
-        # Standard NKBIP-01 fields
-        if "image" in metadata:
-            index_metadata["image"] = metadata["image"]
-        if "summary" in metadata:
-            index_metadata["summary"] = metadata["summary"]
-        if "published_on" in metadata:
-            index_metadata["published_on"] = metadata["published_on"]
-        elif "published" in metadata:
-            index_metadata["published_on"] = metadata["published"]
-        if "published_by" in metadata:
-            index_metadata["published_by"] = metadata["published_by"]
-        elif "publisher" in metadata:
-            index_metadata["published_by"] = metadata["publisher"]
-        if "source" in metadata:
-            index_metadata["source"] = metadata["source"]
-        if "doi" in metadata:
-            index_metadata["doi"] = metadata["doi"]
-        if "isbn" in metadata:
-            index_metadata["isbn"] = metadata["isbn"]
-        if "issn" in metadata:
-            index_metadata["issn"] = metadata["issn"]
-        if "tags" in metadata:
-            index_metadata["tags"] = metadata["tags"]
-        if "additional_authors" in metadata:
-            index_metadata["additional_authors"] = metadata["additional_authors"]
-        
+        for field in _INDEX_FIELDS:
+            if field in metadata:
+                index_metadata[field] = metadata[field]
+            else:
+                fallback = _INDEX_FIELD_FALLBACKS.get(field)
+                if fallback and fallback in metadata:
+                    index_metadata[field] = metadata[fallback]
+
         # Add version if present
-        if "version" in metadata:
-            version = metadata["version"]
-        else:
-            version = "1"
+        version = metadata.get("version", "1")
     else:
         version = "1"
     
@@ -402,35 +478,22 @@ def create_index_event(
     if metadata and "language" in metadata:
         # Extract ISO 639-1 code if full language name is provided
         lang_value = metadata["language"].lower()
-        if lang_value in ["english", "en"]:
-            language = "en"
-        elif lang_value in ["spanish", "es", "español"]:
-            language = "es"
-        elif lang_value in ["french", "fr", "français"]:
-            language = "fr"
-        else:
-            language = lang_value[:2]  # Take first 2 chars as fallback
+        language = _LANG_TABLE.get(lang_value, lang_value[:2])
     
     # Create NKBIP-01 compliant tags
+    d_tag = clean_tag(title)
     index_tags = NKBIP01Tags.create_index_tags(
         title=title,
-        d_tag=clean_tag(title),
+        d_tag=d_tag,
         author=author or (metadata.get("author") if metadata else None),
         publication_type=pub_type,
         auto_update="yes",
         language=language,
         version=version,
         external=False,
-        metadata=index_metadata
+        metadata=index_metadata,
+        author_pubkey=author_pubkey,
     )
-    
-    # Add author pubkey if provided
-    if author_pubkey:
-        # Find position after auto-update tag
-        for i, tag in enumerate(index_tags):
-            if tag[0] == "auto-update":
-                index_tags.insert(i + 1, ["p", author_pubkey])
-                break
 
     # Add section references
     for section in section_events:
@@ -441,7 +504,7 @@ def create_index_event(
     event = create_event(30040, "", index_tags, key, decrypt=decrypt, env_pw=env_pw)
     if verify_event(event):
         print(f"Event verified: {event['id']}")
-        return event
+        return event, d_tag
     else:
         print("Index event verification failed!")
         sys.exit(1)
@@ -502,6 +565,10 @@ def main():
             )
 
     if args.external_url:
+        # Imported here: the HTML metadata stack is only needed for the
+        # --external-url flow and is slow to import
+        import metadata_parser
+
         page = metadata_parser.MetadataParser(args.external_url, search_head_only=True)
         # extract open graph metadata
         open_graph = page.metadata["og"]
@@ -544,36 +611,59 @@ def main():
         args.author = metadata["author"]
         print(f"Using author from document: {args.author}")
 
-    # Organize sections using document title as root if needed
-    organized = organize_sections(doc["title"], doc["sections"])
-    if not organized:
-        print("Error: No sections found in document")
-        sys.exit(1)
-
     # Track all events for summary and publishing
     all_events = []
     primary_relay = args.relays[0]
     root_references = []  # Track everything to link in root 30040
+    root_title = None
 
-    for l1_section in organized:
-        section_events = []
+    # Organize sections using document title as root if needed; events
+    # are created per group as the generator yields it
+    for l1_section in iter_sections(doc["title"], doc["sections"]):
+        if l1_section["is_root"]:
+            root_title = l1_section["title"]
 
-        # Handle L2 sections under this L1
-        for l2_section in l1_section["l2_sections"]:
-            event = create_content_event(
-                l2_section["content"],
-                l2_section["title"],
-                l1_section["title"],
-                key,
-                args.author,
-                env_pw=args.env_pw,
-            )
+        section_events = []
 
+        # Handle L2 sections under this L1; each event is independent,
+        # so sign and verify them concurrently and gather in order
+        l2_sections = l1_section["l2_sections"]
+        if len(l2_sections) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(l2_sections))
+            ) as pool:
+                events = list(
+                    pool.map(
+                        lambda l2: create_content_event(
+                            l2["content"],
+                            l2["title"],
+                            l1_section["title"],
+                            key,
+                            args.author,
+                            env_pw=args.env_pw,
+                        ),
+                        l2_sections,
+                    )
+                )
+        else:
+            events = [
+                create_content_event(
+                    l2["content"],
+                    l2["title"],
+                    l1_section["title"],
+                    key,
+                    args.author,
+                    env_pw=args.env_pw,
+                )
+                for l2 in l2_sections
+            ]
+
+        for l2_section, (event, d_tag) in zip(l2_sections, events):
             section_events.append(
                 {
                     "event": event,
                     "title": l2_section["title"],
-                    "d_tag": next(tag[1] for tag in event["tags"] if tag[0] == "d"),
+                    "d_tag": d_tag,
                 }
             )
             all_events.append(("Content", event))
@@ -581,7 +671,7 @@ def main():
         # Create 30040 index for this L1 section only if it's not the root
         if not l1_section["is_root"] and section_events:
             # Each L1 section gets its own index, but without the full metadata
-            l1_index = create_index_event(
+            l1_index, l1_d_tag = create_index_event(
                 l1_section["title"],
                 section_events,
                 key,
@@ -595,15 +685,18 @@ def main():
                 {
                     "event": l1_index,
                     "title": l1_section["title"],
-                    "d_tag": next(tag[1] for tag in l1_index["tags"] if tag[0] == "d"),
+                    "d_tag": l1_d_tag,
                 }
             )
         elif l1_section["is_root"]:
             # For root section, add its L2 sections directly to root references
             root_references.extend(section_events)
 
+    if root_title is None:
+        print("Error: No sections found in document")
+        sys.exit(1)
+
     # Create root index event linking everything with full metadata
-    root_title = next(s["title"] for s in organized if s["is_root"])
     print("\nCreating root index event...")
 
     # Process author pubkey if provided
@@ -611,7 +704,7 @@ def main():
         warnings.warn("Author pubkey in npub format. Converting to pubkey...")
         args.author_pubkey = nak_decode(args.author_pubkey)["pubkey"]
     # Create the root index with full metadata
-    root_index = create_index_event(
+    root_index, _ = create_index_event(
         root_title,
         root_references,
         key,
@@ -637,13 +730,16 @@ def main():
     else:
         print("\nAuto-confirming publication...")
 
-    # Publish events in order: content -> indexes -> root
+    # Publish events in order: content -> indexes -> root. The whole
+    # batch goes through one nak invocation per attempt instead of one
+    # blocking round trip per event
     print(f"\nPublishing events to relays: {', '.join(args.relays)}")
 
+    results = publish_events_batch([event for _, event in all_events], args.relays)
+
     all_success = True
-    for event_type, event in all_events:
-        print(f"\nPublishing {event_type}...")
-        if not publish_event(event, args.relays):
+    for (event_type, event), published in zip(all_events, results):
+        if not published:
             print(f"Failed to publish {event_type} event!")
             all_success = False
 
@@ -5,22 +5,73 @@ Creates hierarchical Nostr publications from OER course data
 """
 
 import argparse
-import json
 import sys
 import requests
-from typing import Dict, List, Optional
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, quote
 import re
 
+from modules import _json
 from modules.tag_utils import clean_tag
 from modules.key_utils import read_encrypted_key
-from modules.event_creator import create_event
+from modules.event_creator import create_event, get_pubkey
 from modules.event_verifier import verify_event
-from modules.event_publisher import publish_event
+from modules.event_publisher import publish_event, publish_events_batch
 from modules.event_utils import print_event_summary
 from modules.nkbip01_tags import NKBIP01Tags
 
 
+# Fallback number extraction for lectures no sort pattern matched
+_NUM_RE = re.compile(r"\d+")
+
+# Placeholder-content rewriting for the AsciiDoc export: markdown
+# headers and blank lines are dropped until the first placeholder or
+# markdown content header, placeholder lines are commented out and the
+# content header becomes a TODO marker
+_SWITCH_RE = re.compile(
+    r"^(?:[^\S\n]*This is a placeholder|[^\S\n]+## Content[^\S\n]*$)", re.MULTILINE
+)
+_MD_OR_BLANK_LINE_RE = re.compile(r"^(?:#[^\n]*|[ \t]*)(?:\n|$)", re.MULTILINE)
+_PLACEHOLDER_RE = re.compile(r"^([^\S\n]*This is a placeholder.*)$", re.MULTILINE)
+_CONTENT_HDR_RE = re.compile(r"^[^\S\n]*## Content[^\S\n]*(?:\n|$)", re.MULTILINE)
+
+# AsciiDoc attribute lines emitted by export_to_asciidoc, in order;
+# the frozenset additionally covers the keys given special treatment
+_ADOC_ATTR_KEYS = (
+    "author",
+    "published_on",
+    "published_by",
+    "source",
+    "license",
+    "language",
+)
+_ADOC_KNOWN_KEYS = frozenset(_ADOC_ATTR_KEYS) | {"title", "tags", "summary", "image"}
+
+_SESSION = None
+
+
+def _get_session() -> requests.Session:
+    """Shared session so concurrent fetches reuse pooled connections"""
+    global _SESSION
+    if _SESSION is None:
+        session = requests.Session()
+        # Retry transient gateway errors with backoff at the transport
+        # level so every fetch gets the same policy for free
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
 def fetch_oer_metadata(resource_id: str) -> Dict:
     """Fetch metadata from OER API"""
     # Handle both full URLs and just the resource ID
@@ -37,9 +88,13 @@ def fetch_oer_metadata(resource_id: str) -> Dict:
     url = f"https://oersi.org/resources/{resource_id}?format=json"
     print(f"Fetching metadata from: {url}")
 
-    response = requests.get(url)
+    # (connect, read) timeouts keep one stuck resource from hanging a
+    # whole collection fetch
+    response = _get_session().get(url, timeout=(5, 30))
     response.raise_for_status()
-    resp = response.json()
+    # Decode the raw bytes with the shared orjson-backed helper rather
+    # than response.json(); OER payloads run to hundreds of KB
+    resp = _json.loads(response.content)
     resp["oer"] = oer_url
     return resp
 
@@ -53,33 +108,30 @@ def extract_course_metadata(data: Dict) -> Dict:
         "source": data.get("id", ""),
         "i": data.get("oer", ""),
         "k": "web",
-        "tags": [],
+        # Keywords become tags, with "oer" always appended
+        "tags": [clean_tag(k) for k in data.get("keywords", [])] + ["oer"],
     }
 
-    # Extract creator information
-    creators = data.get("creator", [])
-    if creators:
-        # Use first person as primary author
-        for creator in creators:
-            if creator.get("type") == "Person":
-                metadata["author"] = creator.get("name", "")
-                if creator.get("honorificPrefix"):
-                    metadata["author"] = (
-                        f"{creator['honorificPrefix']} {metadata['author']}"
-                    )
-                break
-
-        # Add organizations to published_by
-        orgs = [c.get("name") for c in creators if c.get("type") == "Organization"]
-        if orgs:
-            metadata["published_by"] = ", ".join(orgs)
-
-    # Extract keywords as tags
-    keywords = data.get("keywords", [])
-    if keywords:
-        metadata["tags"] = [clean_tag(k) for k in keywords]
+    # Extract creator information in one pass: the first Person becomes
+    # the primary author, organizations collect into published_by
+    author = None
+    orgs = []
+    for creator in data.get("creator", []):
+        creator_type = creator.get("type")
+        if creator_type == "Person" and author is None:
+            author = creator.get("name", "")
+            prefix = creator.get("honorificPrefix")
+            if prefix:
+                author = f"{prefix} {author}"
+        elif creator_type == "Organization":
+            name = creator.get("name")
+            if name:
+                orgs.append(name)
+    if author is not None:
+        metadata["author"] = author
+    if orgs:
+        metadata["published_by"] = ", ".join(orgs)
 
-    metadata["tags"].append("oer")
     # License
     license_info = data.get("license", {})
     if isinstance(license_info, dict) and "id" in license_info:
@@ -107,43 +159,45 @@ def create_lecture_content_event(
     key: str,
     metadata: Dict,
     env_pw: Optional[str] = None,
-) -> Dict:
-    """Create a 30041 content event for a lecture"""
+) -> Tuple[Dict, str]:
+    """Create a 30041 content event for a lecture, returning (event, d_tag)"""
     lecture_title = lecture_data.get("name", "Untitled Lecture")
     lecture_id = lecture_data.get("id", "")
 
-    # Create placeholder content with metadata
-    content_lines = [
-        f"= {lecture_title}",
-        "",
-        f"This is a placeholder for lecture content from: {lecture_id}",
-        "",
-        "== Lecture Information",
-        f"* Part of: {parent_title}",
-        f"* Source: {lecture_id}",
-    ]
-
-    if metadata.get("author"):
-        content_lines.append(f"- Instructor: {metadata['author']}")
-
-    if metadata.get("license"):
-        content_lines.append(f"- License: {metadata['license']}")
-
-    content_lines.extend(
-        [
-            "",
-            "== Content",
-            "The actual lecture content would be extracted and placed here.\n",
-            "This could include:\n",
-            "* Video transcripts\n",
-            "* Lecture notes\n",
-            "* Slides\n",
-            "* Additional resources",
-        ]
+    # Each metadata key is read once up front
+    author = metadata.get("author")
+    license_id = metadata.get("license")
+
+    # Create placeholder content with metadata; the template is mostly
+    # static, so it is emitted as one string instead of a joined list
+    instructor_line = f"- Instructor: {author}\n" if author else ""
+    license_line = f"- License: {license_id}\n" if license_id else ""
+
+    content = (
+        f"= {lecture_title}\n"
+        "\n"
+        f"This is a placeholder for lecture content from: {lecture_id}\n"
+        "\n"
+        "== Lecture Information\n"
+        f"* Part of: {parent_title}\n"
+        f"* Source: {lecture_id}\n"
+        f"{instructor_line}"
+        f"{license_line}"
+        "\n"
+        "== Content\n"
+        "The actual lecture content would be extracted and placed here.\n"
+        "\n"
+        "This could include:\n"
+        "\n"
+        "* Video transcripts\n"
+        "\n"
+        "* Lecture notes\n"
+        "\n"
+        "* Slides\n"
+        "\n"
+        "* Additional resources"
     )
 
-    content = "\n".join(content_lines)
-
     # Create d-tag from lecture title
     d_tag = f"{clean_tag(parent_title)}-{clean_tag(lecture_title)}"
 
@@ -159,14 +213,16 @@ def create_lecture_content_event(
     tags.append(["source", lecture_id])
 
     # Add author if available
-    if metadata.get("author"):
-        tags.append(["author", metadata["author"]])
+    if author:
+        tags.append(["author", author])
 
     # Create and verify event
     event = create_event(30041, content, tags, key, decrypt=True, env_pw=env_pw)
     if verify_event(event):
         print(f"Created content event for: {lecture_title}")
-        return event
+        # The d-tag is already in hand here; returning it saves callers
+        # a scan over the tags
+        return event, d_tag
     else:
         print(f"Failed to verify event for: {lecture_title}")
         sys.exit(1)
@@ -178,96 +234,79 @@ def export_to_asciidoc(
     """Export course/collection to a single AsciiDoc file"""
     print(f"\nExporting to AsciiDoc file: {filename}")
 
-    with open(filename, "w", encoding="utf-8") as f:
-        # Write document title
-        f.write(f"= {metadata['title']}\n")
-
-        # Write metadata as AsciiDoc attributes
-        if metadata.get("author"):
-            f.write(f":author: {metadata['author']}\n")
-
-        if metadata.get("published_on"):
-            f.write(f":published_on: {metadata['published_on']}\n")
-
-        if metadata.get("published_by"):
-            f.write(f":published_by: {metadata['published_by']}\n")
-
-        if metadata.get("source"):
-            f.write(f":source: {metadata['source']}\n")
-
-        if metadata.get("license"):
-            f.write(f":license: {metadata['license']}\n")
-
-        if metadata.get("language"):
-            f.write(f":language: {metadata['language']}\n")
-
-        if metadata.get("tags"):
-            f.write(f":tags: {', '.join(metadata['tags'])}\n")
-
-        # Add any additional metadata fields
-        for key, value in metadata.items():
-            if key not in [
-                "title",
-                "author",
-                "published_on",
-                "published_by",
-                "source",
-                "license",
-                "language",
-                "tags",
-                "summary",
-                "image",
-            ]:
-                f.write(f":{key}: {value}\n")
-
-        f.write("\n")
-
-        # Write image if present
-        if metadata.get("image"):
-            f.write(f"image::{metadata['image']}[{metadata['title']}]\n\n")
-
-        # Write summary
-        if metadata.get("summary"):
-            f.write(f"{metadata['summary']}\n\n")
-
-        # Write each lecture/content as a level 2 section
-        for item in lecture_events:
-            event = item["event"]
-
-            # Extract title from event tags
-            title = next(
-                (tag[1] for tag in event["tags"] if tag[0] == "title"), item["title"]
-            )
+    # Assemble the whole document in memory and write it once; each
+    # metadata key is read exactly once
+    title = metadata["title"]
+    parts = [f"= {title}\n"]
+
+    # Write metadata as AsciiDoc attributes
+    for key in _ADOC_ATTR_KEYS:
+        value = metadata.get(key)
+        if value:
+            parts.append(f":{key}: {value}\n")
+
+    doc_tags = metadata.get("tags")
+    if doc_tags:
+        parts.append(f":tags: {', '.join(doc_tags)}\n")
+
+    # Add any additional metadata fields
+    for key, value in metadata.items():
+        if key not in _ADOC_KNOWN_KEYS:
+            parts.append(f":{key}: {value}\n")
 
-            # Write section header
-            f.write(f"== {title}\n\n")
+    parts.append("\n")
 
-            # Extract source URL if available
-            source_url = next(
-                (tag[1] for tag in event["tags"] if tag[0] == "source"), None
+    # Write image if present
+    image = metadata.get("image")
+    if image:
+        parts.append(f"image::{image}[{title}]\n\n")
+
+    # Write summary
+    summary = metadata.get("summary")
+    if summary:
+        parts.append(f"{summary}\n\n")
+
+    # Write each lecture/content as a level 2 section
+    for item in lecture_events:
+        event = item["event"]
+
+        # One pass over the tags serves both lookups below
+        tag_map = {tag[0]: tag[1] for tag in event["tags"]}
+
+        # Write section header
+        title = tag_map.get("title", item["title"])
+        parts.append(f"== {title}\n\n")
+
+        # Extract source URL if available
+        source_url = tag_map.get("source")
+        if source_url:
+            parts.append(f"_Source: {source_url}_\n\n")
+
+        # Write content, skipping the markdown headers in placeholder
+        # content since we're using AsciiDoc; the rewrites run as
+        # compiled substitutions instead of a per-line state machine
+        content = event["content"]
+        switch = _SWITCH_RE.search(content)
+        cut = switch.start() if switch else len(content)
+        # The line loop emitted one newline per split element, so a
+        # trailing newline after the switch point meant an extra blank
+        trailing_blank = switch is not None and content.endswith("\n")
+        content = _MD_OR_BLANK_LINE_RE.sub("", content[:cut]) + content[cut:]
+        if content:
+            if not content.endswith("\n"):
+                content += "\n"
+            if trailing_blank:
+                content += "\n"
+            content = _PLACEHOLDER_RE.sub(r"// \1", content)
+            content = _CONTENT_HDR_RE.sub(
+                "\n// TODO: Add actual content here\n\n", content
             )
-            if source_url:
-                f.write(f"_Source: {source_url}_\n\n")
-
-            # Write content
-            content = event["content"]
-
-            # Skip the markdown headers in placeholder content since we're using AsciiDoc
-            lines = content.split("\n")
-            skip_headers = True
-            for line in lines:
-                if skip_headers and (line.startswith("#") or line.strip() == ""):
-                    continue
-                elif line.strip().startswith("This is a placeholder"):
-                    skip_headers = False
-                    f.write("// " + line + "\n")
-                elif line.strip() == "## Content":
-                    f.write("\n// TODO: Add actual content here\n\n")
-                    skip_headers = False
-                else:
-                    f.write(line + "\n")
-
-            f.write("\n")
+            parts.append(content)
+
+        parts.append("\n")
+
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
 
     print(f"Successfully exported {len(lecture_events)} sections to {filename}")
     print("\nYou can now:")
@@ -278,6 +317,32 @@ def export_to_asciidoc(
     )
 
 
+def _lecture_sort_key(name: str, pattern_rules: List[tuple]) -> tuple:
+    """Sort key for a lecture name: (priority, number, name)"""
+    # Try each pattern in priority order
+    for priority, pattern in pattern_rules:
+        match = pattern.search(name)
+        if match:
+            # Extract number from first capture group if available
+            if match.groups():
+                try:
+                    # Try to convert captured group to int
+                    return (priority, int(match.group(1)), "")
+                except (ValueError, IndexError):
+                    # Non-numeric or no capture group
+                    return (priority, 0, name)
+            # Pattern matched but no capture group
+            return (priority, 0, name)
+
+    # No pattern matched - put at end
+    # Try to extract any number for sub-sorting
+    number_match = _NUM_RE.search(name)
+    if number_match:
+        return (999, int(number_match.group(0)), name)
+
+    return (999, 999, name)
+
+
 def sort_lectures(lectures: List[Dict], patterns: List[str] = None) -> List[Dict]:
     """Sort lectures using multiple patterns with priorities
 
@@ -310,37 +375,22 @@ def sort_lectures(lectures: List[Dict], patterns: List[str] = None) -> List[Dict
         # Default pattern
         pattern_rules = [(1, r"Lecture (\d+)")]
 
-    # Sort patterns by priority
+    # Sort patterns by priority, compiling each once; the comparator
+    # runs them against every lecture name
     pattern_rules.sort(key=lambda x: x[0])
+    pattern_rules = [
+        (priority, re.compile(pattern)) for priority, pattern in pattern_rules
+    ]
 
-    def get_sort_key(lecture: Dict) -> tuple:
-        name = lecture.get("name", "")
-
-        # Try each pattern in priority order
-        for priority, pattern in pattern_rules:
-            match = re.search(pattern, name)
-            if match:
-                # Extract number from first capture group if available
-                if match.groups():
-                    try:
-                        # Try to convert captured group to int
-                        return (priority, int(match.group(1)), "")
-                    except (ValueError, IndexError):
-                        # Non-numeric or no capture group
-                        return (priority, 0, name)
-                else:
-                    # Pattern matched but no capture group
-                    return (priority, 0, name)
-
-        # No pattern matched - put at end
-        # Try to extract any number for sub-sorting
-        number_match = re.search(r"\d+", name)
-        if number_match:
-            return (999, int(number_match.group(0)), name)
-
-        return (999, 999, name)
-
-    return sorted(lectures, key=get_sort_key)
+    # Decorate-sort-undecorate: one key computation per lecture through
+    # the module-level key function (plain locals, no closure cells),
+    # with the original index as tiebreaker to keep the sort stable
+    decorated = [
+        (_lecture_sort_key(lecture.get("name", ""), pattern_rules), i, lecture)
+        for i, lecture in enumerate(lectures)
+    ]
+    decorated.sort()
+    return [lecture for _, _, lecture in decorated]
 
 
 def main():
@@ -390,56 +440,58 @@ def main():
     # Read key
     key = read_encrypted_key(args.nsec) if args.nsec.startswith("/") else args.nsec
 
+    # Every mode feeds the same content pipeline below; each branch
+    # only queues jobs of (label, lecture_data, parent_title, metadata)
+    all_events = []
+    lecture_events = []
+    content_jobs = []
+    lectures = []
+    primary_relay = args.relays[0]
+
     # Handle multiple URLs (collection mode)
     if len(args.oer_url) > 1:
         print(f"\nCollection mode: Processing {len(args.oer_url)} resources")
 
-        # Create a collection index
         collection_title = (
             args.collection_title or f"OER Collection ({len(args.oer_url)} items)"
         )
-        all_events = []
-        lecture_events = []
-        primary_relay = args.relays[0]
 
-        # Process each URL as a content item
-        for idx, url in enumerate(args.oer_url, 1):
+        # Fetch all resources concurrently; the fetches are independent
+        # network round trips, so the batch costs ~max(latency) instead
+        # of the sum. Event creation below stays serial to keep ordering.
+        def fetch_one(url: str):
             try:
-                resource_data = fetch_oer_metadata(url)
-                resource_meta = extract_course_metadata(resource_data)
-                print(
-                    f"\n[{idx}/{len(args.oer_url)}] Processing: {resource_meta['title']}"
-                )
+                return fetch_oer_metadata(url)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(16, len(args.oer_url))) as pool:
+            fetched = list(pool.map(fetch_one, args.oer_url))
 
-                # Create content event for this resource
-                event = create_lecture_content_event(
+        # Queue each URL as a content item
+        for idx, (url, resource_data) in enumerate(zip(args.oer_url, fetched), 1):
+            if isinstance(resource_data, Exception):
+                print(f"Error processing {url}: {resource_data}")
+                continue
+            try:
+                resource_meta = extract_course_metadata(resource_data)
+            except Exception as e:
+                print(f"Error processing {url}: {e}")
+                continue
+            print(
+                f"\n[{idx}/{len(args.oer_url)}] Processing: {resource_meta['title']}"
+            )
+            content_jobs.append(
+                (
+                    f"Resource {idx}",
                     {
                         "name": resource_meta["title"],
                         "id": resource_meta.get("source", url),
                     },
                     collection_title,
-                    key,
                     resource_meta,
-                    args.env_pw,
                 )
-
-                d_tag = next(tag[1] for tag in event["tags"] if tag[0] == "d")
-                lecture_events.append(
-                    {"event": event, "title": resource_meta["title"], "d_tag": d_tag}
-                )
-                all_events.append((f"Resource {idx}", event))
-
-            except Exception as e:
-                print(f"Error processing {url}: {e}")
-                continue
-
-        # Create collection index
-        print("\nCreating collection index...")
-        collection_metadata = {
-            "title": collection_title,
-            "summary": f"A curated collection of {len(lecture_events)} educational resources",
-            "tags": ["collection", "oer"],
-        }
+            )
 
     # Handle single URL
     else:
@@ -463,24 +515,14 @@ def main():
         if args.standalone or not lectures:
             # Standalone mode: create both 30040 and 30041 for single resource
             print("\nStandalone mode: Creating index and content for single resource")
-            all_events = []
-            lecture_events = []
-            primary_relay = args.relays[0]
-
-            # Create content event
-            content_event = create_lecture_content_event(
-                {"name": metadata["title"], "id": metadata.get("source", "")},
-                metadata["title"],
-                key,
-                metadata,
-                args.env_pw,
-            )
-
-            d_tag = next(tag[1] for tag in content_event["tags"] if tag[0] == "d")
-            lecture_events.append(
-                {"event": content_event, "title": metadata["title"], "d_tag": d_tag}
+            content_jobs.append(
+                (
+                    "Content",
+                    {"name": metadata["title"], "id": metadata.get("source", "")},
+                    metadata["title"],
+                    metadata,
+                )
             )
-            all_events.append(("Content", content_event))
 
         else:
             # Course mode: process all lectures
@@ -497,31 +539,33 @@ def main():
             for i, lecture in enumerate(lectures, 1):
                 print(f"  {i}. {lecture.get('name', 'Untitled')}")
 
-            # Continue with normal course processing...
-            all_events = []
-            lecture_events = []
-            primary_relay = args.relays[0]
-
-            # Create content events for each lecture
-            for lecture in lectures:
-                event = create_lecture_content_event(
-                    lecture, metadata["title"], key, metadata, args.env_pw
-                )
+            content_jobs.extend(
+                ("Lecture Content", lecture, metadata["title"], metadata)
+                for lecture in lectures
+            )
 
-                d_tag = next(tag[1] for tag in event["tags"] if tag[0] == "d")
-                lecture_events.append(
-                    {
-                        "event": event,
-                        "title": lecture.get("name", "Untitled"),
-                        "d_tag": d_tag,
-                    }
-                )
-                all_events.append(("Lecture Content", event))
+    # One shared pipeline: create each content event and record it
+    for label, lecture_data, parent_title, item_meta in content_jobs:
+        event, d_tag = create_lecture_content_event(
+            lecture_data, parent_title, key, item_meta, args.env_pw
+        )
+        lecture_events.append(
+            {
+                "event": event,
+                "title": lecture_data.get("name", "Untitled"),
+                "d_tag": d_tag,
+            }
+        )
+        all_events.append((label, event))
 
     # Now create the index event based on mode
     if len(args.oer_url) > 1:
-        # Use collection metadata for multiple URLs
-        metadata = collection_metadata
+        # Synthesize collection metadata once the events exist
+        metadata = {
+            "title": collection_title,
+            "summary": f"A curated collection of {len(lecture_events)} educational resources",
+            "tags": ["collection", "oer"],
+        }
         index_title = "Collection Index"
     elif args.standalone or not lectures:
         # Use resource metadata for standalone
@@ -530,37 +574,26 @@ def main():
         # Use course metadata for courses with lectures
         index_title = "Course Index"
 
-    # Create index event
+    # Create index event; the pubkey is derived up front so the content
+    # references go into the tag list before signing, instead of
+    # signing once to learn the pubkey and re-signing with the refs
     print(f"\nCreating {index_title.lower()}...")
+    pubkey = get_pubkey(key, env_pw=args.env_pw)
+    # The kind/pubkey half of each address is loop-invariant
+    addr_prefix = f"30041:{pubkey}:"
+    index_tags = NKBIP01Tags.create_index_tags(
+        title=metadata["title"],
+        d_tag=clean_tag(metadata["title"]),
+        author=metadata.get("author"),
+        publication_type="course" if lectures else "resource",
+        language=metadata.get("language", "en"),
+        metadata=metadata,
+    ) + [
+        ["a", addr_prefix + item["d_tag"], primary_relay, item["event"]["id"]]
+        for item in lecture_events
+    ]
     index_event = create_event(
-        30040,
-        "",
-        NKBIP01Tags.create_index_tags(
-            title=metadata["title"],
-            d_tag=clean_tag(metadata["title"]),
-            author=metadata.get("author"),
-            publication_type="course" if lectures else "resource",
-            language=metadata.get("language", "en"),
-            metadata=metadata,
-        ),
-        key,
-        decrypt=True,
-        env_pw=args.env_pw,
-    )
-
-    # Add content references to index
-    for item in lecture_events:
-        ref_tag = [
-            "a",
-            f"30041:{index_event['pubkey']}:{item['d_tag']}",
-            primary_relay,
-            item["event"]["id"],
-        ]
-        index_event["tags"].append(ref_tag)
-
-    # Re-sign the index with references
-    index_event = create_event(
-        30040, "", index_event["tags"], key, decrypt=True, env_pw=args.env_pw
+        30040, "", index_tags, key, decrypt=True, env_pw=args.env_pw
     )
 
     if verify_event(index_event):
@@ -594,12 +627,24 @@ def main():
     # Publish events
     print(f"\nPublishing events to relays: {', '.join(args.relays)}")
 
+    # Content events go out as one batch; the 30040 index is published
+    # on its own afterwards so readers never see an index whose
+    # references are not yet on the relay
+    content_items = all_events[:-1]
     all_success = True
-    for event_type, event in all_events:
-        print(f"\nPublishing {event_type}...")
-        if not publish_event(event, args.relays):
-            print(f"Failed to publish {event_type} event!")
-            all_success = False
+    if content_items:
+        results = publish_events_batch(
+            [event for _, event in content_items], args.relays
+        )
+        for (event_type, _), ok in zip(content_items, results):
+            if not ok:
+                print(f"Failed to publish {event_type} event!")
+                all_success = False
+
+    print(f"\nPublishing {index_title}...")
+    if not publish_event(index_event, args.relays):
+        print(f"Failed to publish {index_title} event!")
+        all_success = False
 
     if all_success:
         print("\nAll events published successfully!")